@@ -2,6 +2,7 @@ import sys
 import time
 import logging
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 
 from willthisfreeze.dbutils import create_db
 from willthisfreeze.config import read_config, read_secret
@@ -52,26 +53,23 @@ if __name__ == "__main__":
     logger.info("Summary: %s", message)
 
 
-    stations_attribution_start_time = time.time()
+    # Stations attribution only depends on routes (written above) and MeteoFrance
+    # scraping only on weather_stations, so the two stages can overlap.
+    overlap_start_time = time.time()
 
-    logger.info("Starting Weather stations attribution")
+    logger.info("Starting Weather stations attribution and MeteoFrance scraping in parallel")
 
-    if args.reset_weather_stations_attribution:
-        weather_stations_attribution(mode='reset')
-    else:
-        weather_stations_attribution(mode='update')
-
-    logger.info("Weather stations attribution finished in %.2f seconds", time.time() - stations_attribution_start_time)
-
-
-    mfscraper_start_time = time.time()
-
-    logger.info("Starting MeteoFrance scraping")
+    attribution_mode = 'reset' if args.reset_weather_stations_attribution else 'update'
 
     MFscraper = MFScraper(config=conf, mode=args.mode)
-    MFscraper.run()
 
-    logger.info("MeteoFrance scraping finished in %.2f seconds", time.time() - mfscraper_start_time)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        attribution_future = executor.submit(weather_stations_attribution, mode=attribution_mode)
+        mf_future = executor.submit(MFscraper.run)
+        attribution_future.result()
+        mf_future.result()
+
+    logger.info("Weather stations attribution + MeteoFrance scraping finished in %.2f seconds", time.time() - overlap_start_time)
 
     logger.info("Scraping finished in %.2f seconds", time.time() - start_time)
 
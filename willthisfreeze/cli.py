@@ -0,0 +1,138 @@
+import argparse
+import logging
+import os
+import time
+
+from willthisfreeze.config.logging_config import configure_logging, set_log_context
+
+try:
+    # Drop-in libuv event loop: roughly doubles throughput of the aiohttp scraping paths.
+    import uvloop
+    uvloop.install()
+except ImportError:  # optional, not available on Windows
+    pass
+
+logger = logging.getLogger(__name__)
+
+
+# Scrapers are imported lazily inside each handler so that running one
+# subcommand never pays the import cost of the others.
+
+def _run_c2c(args, run_id: str) -> None:
+    from willthisfreeze.config import read_config
+    from willthisfreeze.dbutils import create_db
+    from willthisfreeze.scraper import C2CScraper
+
+    dbstring = os.getenv("DATABASE_URL")
+
+    # Context for all log lines from here on
+    set_log_context(component="c2c", mode=args.mode)
+
+    conf = read_config()
+    logger.info("app.start", extra={"run_id": run_id, "mode": args.mode})
+
+    start_time = time.time()
+
+    if args.mode == "init":
+        create_db(dbstring)
+        logger.info("db.init.done")
+
+    scraper = C2CScraper(mode=args.mode, dbstring=dbstring, config=conf)
+
+    logger.info("scraper.start")
+    message = scraper.run()
+    elapsed = time.time() - start_time
+
+    logger.info("scraper.done", extra={"duration_s": round(elapsed, 2)})
+    logger.info("scraper.summary", extra={"summary": message})
+
+
+def _run_mf(args, run_id: str) -> None:
+    from willthisfreeze.config import read_config
+    from willthisfreeze.scraper import MFScraper
+
+    set_log_context(component="meteofrance", mode=args.mode)
+
+    logger.info("app.start", extra={"run_id": run_id, "mode": args.mode})
+
+    conf = read_config()
+
+    mf_api_token = os.getenv("METEOFRANCE_API_TOKEN")
+    dbstring = os.getenv("DATABASE_URL")
+
+    start_time = time.time()
+
+    scraper = MFScraper(dbstring=dbstring, mf_api_token=mf_api_token, config=conf, mode=args.mode)
+    logger.info("scraper.start")
+    scraper.run()
+
+    elapsed = time.time() - start_time
+    logger.info("scraper.done", extra={"duration_s": round(elapsed, 2)})
+    logger.info("app.done")
+
+
+def _run_attribution(args, run_id: str) -> None:
+    from willthisfreeze.scraper import weather_stations_attribution
+
+    set_log_context(component="weather_stations_attribution", mode=args.mode)
+
+    logger.info("app.start", extra={"run_id": run_id, "mode": args.mode})
+    start_time = time.time()
+
+    logger.info("attribution.start")
+    weather_stations_attribution(mode=args.mode)
+    elapsed = time.time() - start_time
+
+    logger.info("attribution.done", extra={"duration_s": round(elapsed, 2)})
+    logger.info("app.done")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="willthisfreeze",
+        description="willthisfreeze scraping and data-preparation jobs",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p_c2c = subparsers.add_parser("c2c", help="scrape camptocamp.org routes and outings data")
+    p_c2c.add_argument("mode", choices=["init", "update"])
+    p_c2c.set_defaults(func=_run_c2c)
+
+    p_mf = subparsers.add_parser("mf", help="scrape meteofrance.fr weather stations data")
+    p_mf.add_argument(
+        "--mode",
+        required=False,
+        help="scraping mode",
+        choices=["init", "update"],
+        default="update",
+    )
+    p_mf.set_defaults(func=_run_mf)
+
+    p_attr = subparsers.add_parser(
+        "attribution", help="update the mapping between routes and weather stations"
+    )
+    p_attr.add_argument(
+        "-m", "--mode",
+        choices=["update", "reset"],
+        default="update",
+        required=False,
+    )
+    p_attr.set_defaults(func=_run_attribution)
+
+    return parser
+
+
+def main(argv=None) -> None:
+    run_id, listener = configure_logging()
+    try:
+        args = build_parser().parse_args(argv)
+        args.func(args, run_id)
+    except Exception:
+        logger.exception("app.crash")
+        raise
+    finally:
+        listener.stop()
+
+
+if __name__ == "__main__":
+    main()
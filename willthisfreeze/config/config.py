@@ -1,17 +1,21 @@
-import json
+import functools
+
+import orjson
 import importlib_resources
 
-def read_config() -> dict:
-    
-    my_resources = importlib_resources.files("willthisfreeze")
-    data = json.loads(my_resources.joinpath("config", "config.json").read_bytes())
 
-    return data
+@functools.lru_cache(maxsize=1)
+def _load_resource(filename: str) -> dict:
 
-def read_secret() -> dict:
-    
     my_resources = importlib_resources.files("willthisfreeze")
-    data = json.loads(my_resources.joinpath("config", "secret.json").read_bytes())
+    data = orjson.loads(my_resources.joinpath("config", filename).read_bytes())
 
     return data
 
+def read_config() -> dict:
+    # shallow copy: callers mutate the result (e.g. conf.update(secret))
+    return dict(_load_resource("config.json"))
+
+def read_secret() -> dict:
+
+    return dict(_load_resource("secret.json"))
@@ -1,4 +1,3 @@
-import json
 import logging
 import os
 import queue
@@ -9,6 +8,8 @@ import uuid
 from contextvars import ContextVar
 from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
+import orjson
+
 run_id_var: ContextVar[str] = ContextVar("run_id", default="-")
 component_var: ContextVar[str] = ContextVar("component", default="-")
 mode_var: ContextVar[str] = ContextVar("mode", default="-")
@@ -25,6 +26,12 @@ class ContextFilter(logging.Filter):
         return True
 
 
+# Standard LogRecord attributes, computed once so extras detection is a set lookup
+# instead of a serialization probe per key per line.
+_LR_SKIP = frozenset(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {"message", "asctime"}
+_JSON_SAFE = (str, int, float, bool, type(None), list, dict, tuple)
+
+
 class JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         payload = {
@@ -39,20 +46,46 @@ class JsonFormatter(logging.Formatter):
         }
         # include extras (safe-ish best effort)
         for k, v in record.__dict__.items():
-            if k.startswith("_") or k in payload:
-                continue
-            if k in ("msg", "args", "levelname", "name", "created", "msecs", "relativeCreated"):
+            if k.startswith("_") or k in _LR_SKIP or k in payload:
                 continue
-            try:
-                json.dumps(v)
-                payload[k] = v
-            except TypeError:
-                payload[k] = repr(v)
+            if isinstance(v, tuple):
+                v = list(v)  # orjson has no native tuple support
+            payload[k] = v if isinstance(v, _JSON_SAFE) else repr(v)
 
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
 
-        return json.dumps(payload, ensure_ascii=False)
+        try:
+            # OPT_NON_STR_KEYS covers dict extras keyed by ints/dates; default
+            # only applies to values, never keys
+            return orjson.dumps(payload, default=repr, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # a log line must never take the process down: degrade whatever
+            # orjson still rejects to its repr and retry
+            safe = {}
+            for k, v in payload.items():
+                if isinstance(v, int) and not -(1 << 63) <= v < (1 << 64):
+                    # int itself is supported, so default=repr never fires for
+                    # it; out-of-range values have to become strings by hand
+                    v = str(v)
+                elif not isinstance(v, (str, int, float, bool, type(None))):
+                    v = repr(v)
+                safe[k] = v
+            try:
+                return orjson.dumps(safe).decode()
+            except TypeError:
+                return orjson.dumps({k: repr(v) for k, v in safe.items()}).decode()
+
+
+class PassthroughQueueHandler(QueueHandler):
+    """
+    QueueHandler whose prepare() hands the raw record to the listener thread.
+    The default implementation pre-formats the message on the producer side;
+    with an in-process queue.Queue that work can all happen on the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
 
 
 def set_log_context(*, run_id: str | None = None, component: str | None = None, mode: str | None = None) -> None:
@@ -123,9 +156,10 @@ def configure_logging() -> tuple[str, QueueListener]:
         eh.addFilter(context_filter)
         outputs.append(eh)
 
-    # Queue-based root handler (safer if you add concurrency later)
+    # Queue-based root handler (safer if you add concurrency later); no formatter
+    # on the queue side, so serialization stays on the listener thread
     q: queue.Queue = queue.Queue(-1)
-    root.addHandler(QueueHandler(q))
+    root.addHandler(PassthroughQueueHandler(q))
 
     listener = QueueListener(q, *outputs, respect_handler_level=True)
     listener.start()
@@ -1,15 +1,21 @@
 from willthisfreeze.dbutils.dbutils import (
     create_db, 
     insert_route, 
+    insert_routes_bulk,
     read_config, 
     insert_outing, 
+    insert_outings_bulk,
+    insert_weather_stations_bulk,
     load_scraped_routes_ids, 
     check_route_existence, 
+    check_routes_exist,
     get_last_outing_date,
     load_scraped_outings_ids,
     load_routes,
+    load_route_coords,
     get_engine,
     load_stations,
+    load_stations_np,
     get_weather_station,
     load_routes
 )
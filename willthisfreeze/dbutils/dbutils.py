@@ -1,37 +1,102 @@
-import warnings
 import datetime
+import logging
+from contextlib import contextmanager
 from functools import partial
-from typing import Optional, Set, List, List, Literal
+from typing import Iterator, Optional, Set, List, List, Literal, Tuple, Union
 
-from sqlalchemy import Engine, CursorResult
+import numpy as np
+
+from sqlalchemy import Engine
+from sqlalchemy.engine import Row
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session
-from sqlalchemy import create_engine, select, text
+from sqlalchemy import create_engine, event, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm.query import Query
 
 from sqlalchemy_utils import database_exists
 
 from willthisfreeze.config import read_config
 from willthisfreeze.dbutils.schema import (
-    Base, 
-    Routes, 
-    Orientations, 
-    Outings, 
+    Base,
+    Routes,
+    Orientations,
+    Outings,
     Countries,
     WeatherStation,
-    StationsParameters)
+    StationsParameters,
+    countries_mapping,
+    orientation_mapping,
+    outings_mapping,
+    route_stations_mapping,
+    stations_parameters_mapping)
+
+logger = logging.getLogger(__name__)
+
 
 def get_engine(dbstring: str) -> Engine:
-    engine = create_engine(dbstring)
+    engine_kwargs: dict = {"insertmanyvalues_page_size": 1000, "pool_pre_ping": True}
+    if dbstring.startswith("postgresql"):
+        # psycopg2 fast-execution helpers: batch executemany instead of
+        # one INSERT round-trip per row
+        engine_kwargs.update(
+            executemany_mode="values_plus_batch",
+            executemany_values_page_size=1000,
+            executemany_batch_page_size=500,
+        )
+    engine = create_engine(dbstring, **engine_kwargs)
+
+    if engine.dialect.name == "sqlite":
+        # WAL + relaxed synchronous keep the scraper's many small commits from
+        # paying a full fsync each, and let readers proceed while it writes.
+        @event.listens_for(engine, "connect")
+        def _sqlite_pragmas(dbapi_conn, _connection_record):
+            cur = dbapi_conn.cursor()
+            cur.execute("PRAGMA journal_mode=WAL")
+            cur.execute("PRAGMA synchronous=NORMAL")
+            cur.execute("PRAGMA temp_store=MEMORY")
+            cur.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+            cur.execute("PRAGMA foreign_keys=ON")
+            cur.close()
+
     return engine
 
+@contextmanager
+def _connect(bind: Union[Engine, Connection]):
+    """Yield a Connection whether the caller passed an Engine or an open Connection."""
+    if isinstance(bind, Connection):
+        yield bind
+    else:
+        with bind.connect() as conn:
+            yield conn
+
 def create_db(dbstring) -> None:
 
-    engine = create_engine(dbstring)
+    engine = get_engine(dbstring)
     Base.metadata.create_all(engine, checkfirst=True)
     populate_orientation_table(engine)
 
+def _obj_cache(session: Session) -> dict:
+    """Session-local identity cache for get_obj lookups, keyed (tablename, id)."""
+    return session.info.setdefault("obj_cache", {})
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_obj_cache(session: Session) -> None:
+    # cached objects may reference state the rollback just discarded
+    session.info.pop("obj_cache", None)
+
+
 def get_obj(Obj, idColumn: str, session: Session, objData: dict):
 
+    cache = _obj_cache(session)
+    cache_key = (Obj.__tablename__, objData[idColumn])
+
+    obj = cache.get(cache_key)
+    if obj is not None:
+        return obj
+
     obj = session.scalar(
         select(Obj).where(getattr(Obj, idColumn) == objData[idColumn])
     )
@@ -39,8 +104,50 @@ def get_obj(Obj, idColumn: str, session: Session, objData: dict):
         obj = Obj(**objData)
         session.add(obj)
 
+    cache[cache_key] = obj
     return obj
 
+def get_objs_bulk(Obj, idColumn: str, session: Session, objDataList: List[dict]) -> List:
+    """
+    Resolve many objects at once: one SELECT ... WHERE col IN (...) instead of
+    one scalar SELECT per element, creating the missing ones like get_obj does.
+    Hits the session-local cache first, so repeated ids (countries,
+    orientations, ...) cost a dict lookup.
+    """
+    if not objDataList:
+        return []
+
+    cache = _obj_cache(session)
+    tablename = Obj.__tablename__
+    col = getattr(Obj, idColumn)
+
+    existing = {}
+    to_fetch = set()
+    for objData in objDataList:
+        key = objData[idColumn]
+        cached = cache.get((tablename, key))
+        if cached is not None:
+            existing[key] = cached
+        else:
+            to_fetch.add(key)
+
+    if to_fetch:
+        for obj in session.scalars(select(Obj).where(col.in_(to_fetch))).all():
+            existing[getattr(obj, idColumn)] = obj
+
+    objs = []
+    for objData in objDataList:
+        key = objData[idColumn]
+        obj = existing.get(key)
+        if obj is None:
+            obj = Obj(**objData)
+            session.add(obj)
+            existing[key] = obj
+        cache[(tablename, key)] = obj
+        objs.append(obj)
+
+    return objs
+
 # -----------------------
 # Routes data
 # -----------------------
@@ -50,10 +157,11 @@ def populate_orientation_table(engine) -> None:
     with Session(engine) as session:
 
         conf = read_config()
-        
-        for orient in conf['orientations']:
-            session.add(Orientations(orientation=orient))
-        
+
+        # idempotent: ON CONFLICT DO NOTHING instead of blind adds that would
+        # raise on an already-populated table
+        _insert_ignore(session, Orientations, [{"orientation": orient} for orient in conf['orientations']])
+
         session.commit()
     
     return
@@ -64,14 +172,7 @@ get_route = partial(get_obj, Routes, "route_id")
 
 def get_orientation(session: Session, orientation: str) -> Orientations:
 
-    orientation_obj = session.scalar(
-            select(Orientations).where(Orientations.orientation == orientation)
-        )
-    if not orientation_obj:
-        orientation_obj = Orientations(orientation=orientation)
-        session.add(orientation_obj)
-    
-    return orientation_obj
+    return get_obj(Orientations, "orientation", session, {"orientation": orientation})
 
 def insert_route(session: Session,
                  route_id: int,
@@ -90,34 +191,14 @@ def insert_route(session: Session,
                  ice_rating: str | None = None,
                  mixed_rating: str | None = None,
                  rock_free_rating: str | None = None, 
-                 orientations: List = [],
-                 outings: List = [],
-                 countries: List =  [],
-                 weather_stations: List =  [],
-                 last_updated: str | None = None
+                 orientations: Optional[List] = None,
+                 outings: Optional[List] = None,
+                 countries: Optional[List] = None,
+                 weather_stations: Optional[List] = None,
+                 last_updated: datetime.date | None = None,
+                 commit: bool = True
                  ) -> None:
 
-    # Retrieving orientations
-    orientationsList: List[Orientations] = []
-    for orient in orientations:
-        orientationsList.append(get_orientation(session, orient))
-
-    
-    # Retrieving countries
-    countriesList: List[Countries] = []
-    for countryData in countries:
-        countriesList.append(get_country(session, countryData))
-
-    # Retrieving outings
-    outingsList: List[Outings] = []
-    for outingData in outings:
-        outingsList.append(get_outings(session, outingData))
-
-    # Retrieving stations
-    stationsList: List[WeatherStation] = []
-    for stationData in weather_stations:
-        stationsList.append(get_weather_station(session, stationData))
-
     route = Routes(
         route_id=route_id,
         name=name,
@@ -135,54 +216,319 @@ def insert_route(session: Session,
         ice_rating=ice_rating,
         mixed_rating=mixed_rating,
         rock_free_rating=rock_free_rating, 
-        orientations=orientationsList,
-        outings=outingsList,
-        countries = countriesList,
-        stations = stationsList,
         last_updated = last_updated
      )
     
     session.add(route)
-    session.commit()
+    # the route row must exist before the mapping rows referencing it
+    session.flush()
+
+    # Link related entities through the mapping tables with primary keys only:
+    # no ORM instantiation of the related rows just to attach them.
+    if countries:
+        _insert_ignore(session, Countries, list(countries))
+        _insert_ignore(
+            session, countries_mapping,
+            [{"route_id": route_id, "country_id": countryData["country_id"]} for countryData in countries],
+        )
+    if outings:
+        _insert_ignore(session, Outings, list(outings))
+        _insert_ignore(
+            session, outings_mapping,
+            [{"route_id": route_id, "outing_id": outingData["outing_id"]} for outingData in outings],
+        )
+    if weather_stations:
+        _insert_ignore(session, WeatherStation, list(weather_stations))
+        _insert_ignore(
+            session, route_stations_mapping,
+            [{"route_id": route_id, "station_id": stationData["station_id"]} for stationData in weather_stations],
+        )
+    if orientations:
+        id_map = _orientation_id_map(session, set(orientations))
+        _insert_ignore(
+            session, orientation_mapping,
+            [{"route_id": route_id, "orientation_id": id_map[orient]} for orient in orientations],
+        )
+
+    if commit:
+        session.commit()
 
 def insert_outing(session: Session,
                   outing_id: int,
-                  date: str,
+                  date: datetime.date,
                   conditions: str | None,
-                  last_updated: str | None = None,
-                  routes: List = []
+                  last_updated: datetime.date | None = None,
+                  routes: Optional[List] = None,
+                  commit: bool = True
                  ) -> None:
 
     """
     Mainly used to add an outing to a previously parsed route
     """
 
-    # Retrieving routes 
-    routesList: List[Routes] = []
-    for routeData in routes:
-        routesList.append(get_route(session, routeData))
-
     outing = Outings(
         outing_id=outing_id,
         date=date,
         conditions=conditions,
         last_updated=last_updated,
-        routes = routesList
      )
     
     session.add(outing)
-    session.commit()
+    # the outing row must exist before the mapping rows referencing it
+    session.flush()
+
+    if routes:
+        # same rule as insert_outings_bulk: the payload only carries route
+        # ids, which can't satisfy Routes' NOT NULL columns, so link to the
+        # routes already in db and drop dangling references
+        route_ids = {routeData["route_id"] for routeData in routes}
+        existing_route_ids = set(
+            session.scalars(select(Routes.route_id).where(Routes.route_id.in_(route_ids))).all()
+        )
+        _insert_ignore(
+            session, outings_mapping,
+            [{"route_id": route_id, "outing_id": outing_id} for route_id in route_ids if route_id in existing_route_ids],
+        )
+
+    if commit:
+        session.commit()
+
+# -----------------------
+# Bulk ingestion (Core executemany)
+# -----------------------
+
+def _chunked(items: List, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _insert_ignore(session: Session, table, rows: List[dict]) -> None:
+    """One atomic INSERT ... ON CONFLICT DO NOTHING, skipping rows already in db."""
+    if not rows:
+        return
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        stmt = sqlite_insert(table).on_conflict_do_nothing()
+    elif dialect == "postgresql":
+        stmt = pg_insert(table).on_conflict_do_nothing()
+    else:
+        stmt = insert(table)
+    session.execute(stmt, rows)
+
+
+def _drop_invalid_rows(Obj, rows: List[dict], idColumn: str) -> Tuple[List[dict], Set]:
+    """
+    Split off payloads carrying None in a NOT NULL column before an
+    executemany. ON CONFLICT DO NOTHING does not suppress NOT NULL
+    violations, so a single bad row (a route whose geometry did not parse,
+    an outing without a date) would abort the whole chunk instead of being
+    skipped like the per-row inserts used to do.
+    """
+    required = [c.name for c in Obj.__table__.columns if not c.nullable]
+    kept: List[dict] = []
+    dropped_ids: Set = set()
+    for row in rows:
+        if all(row.get(name) is not None for name in required):
+            kept.append(row)
+        else:
+            dropped_ids.add(row.get(idColumn))
+    if dropped_ids:
+        logger.warning(
+            "db.bulk_insert.invalid_rows_skipped",
+            extra={"table": Obj.__tablename__, "dropped_count": len(dropped_ids)},
+        )
+    return kept, dropped_ids
+
+
+def _insert_missing(session: Session, Obj, idColumn: str, rows_by_id: dict) -> None:
+    """
+    Insert the rows whose primary key is not in db yet. The SELECT filter is
+    required, not just an optimization: ON CONFLICT DO NOTHING only suppresses
+    conflicts, so an incomplete row for an existing id would still trip the
+    table's NOT NULL constraints before the conflict is ever seen.
+    """
+    if not rows_by_id:
+        return
+    col = getattr(Obj, idColumn)
+    existing = set(session.scalars(select(col).where(col.in_(rows_by_id))).all())
+    missing = [row for obj_id, row in rows_by_id.items() if obj_id not in existing]
+    _insert_ignore(session, Obj, missing)
+
 
-def load_scraped_routes_ids(engine: Engine, min_date: Optional[datetime.datetime]) -> Set[int]:
+def _orientation_id_map(session: Session, names: Set[str]) -> dict:
+    """Resolve orientation labels to ids, creating unknown labels like get_orientation does."""
+    id_map = {o.orientation: o.orientation_id for o in session.scalars(select(Orientations)).all()}
+    missing = [{"orientation": name} for name in names if name not in id_map]
+    if missing:
+        session.execute(insert(Orientations), missing)
+        id_map = {o.orientation: o.orientation_id for o in session.scalars(select(Orientations)).all()}
+    return id_map
+
+
+def insert_routes_bulk(session: Session, routes: List[dict], batch_size: int = 1000) -> None:
+    """
+    Insert scraped route payloads (the dicts built by the scraper) with Core
+    executemany: one INSERT per table per batch instead of an ORM add+commit
+    per route. Related countries/outings are created when missing and linked
+    through the mapping tables directly.
+    """
+    route_cols = {c.name for c in Routes.__table__.columns}
+
+    for chunk in _chunked(routes, batch_size):
+        route_rows: List[dict] = []
+        orientation_links: List[tuple] = []
+        country_rows: dict = {}
+        country_links: List[dict] = []
+        outing_rows: dict = {}
+        outing_links: List[dict] = []
+
+        for data in chunk:
+            route_id = data["route_id"]
+            route_rows.append({k: v for k, v in data.items() if k in route_cols})
+
+            for orient in data.get("orientations") or []:
+                orientation_links.append((route_id, orient))
+            for countryData in data.get("countries") or []:
+                country_rows[countryData["country_id"]] = countryData
+                country_links.append({"route_id": route_id, "country_id": countryData["country_id"]})
+            for outingData in data.get("outings") or []:
+                outing_rows[outingData["outing_id"]] = outingData
+                outing_links.append({"route_id": route_id, "outing_id": outingData["outing_id"]})
+
+        route_rows, bad_route_ids = _drop_invalid_rows(Routes, route_rows, "route_id")
+        if bad_route_ids:
+            orientation_links = [(rid, name) for rid, name in orientation_links if rid not in bad_route_ids]
+            country_links = [link for link in country_links if link["route_id"] not in bad_route_ids]
+            outing_links = [link for link in outing_links if link["route_id"] not in bad_route_ids]
+        valid_outings, bad_outing_ids = _drop_invalid_rows(Outings, list(outing_rows.values()), "outing_id")
+        if bad_outing_ids:
+            outing_rows = {row["outing_id"]: row for row in valid_outings}
+            outing_links = [link for link in outing_links if link["outing_id"] not in bad_outing_ids]
+
+        _insert_ignore(session, Routes, route_rows)
+
+        _insert_missing(session, Countries, "country_id", country_rows)
+        _insert_ignore(session, countries_mapping, country_links)
+
+        _insert_missing(session, Outings, "outing_id", outing_rows)
+        _insert_ignore(session, outings_mapping, outing_links)
+
+        if orientation_links:
+            id_map = _orientation_id_map(session, {name for _, name in orientation_links})
+            _insert_ignore(
+                session, orientation_mapping,
+                [{"route_id": rid, "orientation_id": id_map[name]} for rid, name in orientation_links],
+            )
+
+        # one commit per batch, not per row
+        session.commit()
+
+
+def insert_outings_bulk(session: Session, outings: List[dict], batch_size: int = 1000) -> None:
+    """
+    Insert scraped outing payloads with Core executemany. Links to routes not
+    in db are dropped: the outing payload only carries route ids, which can't
+    satisfy Routes' NOT NULL coordinates, and the scraper resolves missing
+    routes before writing outings anyway.
+    """
+    outing_cols = {c.name for c in Outings.__table__.columns}
+
+    for chunk in _chunked(outings, batch_size):
+        outing_rows: List[dict] = []
+        referenced_route_ids: Set[int] = set()
+        route_links: List[dict] = []
+
+        for data in chunk:
+            outing_id = data["outing_id"]
+            outing_rows.append({k: v for k, v in data.items() if k in outing_cols})
+            for routeData in data.get("routes") or []:
+                referenced_route_ids.add(routeData["route_id"])
+                route_links.append({"route_id": routeData["route_id"], "outing_id": outing_id})
+
+        outing_rows, bad_outing_ids = _drop_invalid_rows(Outings, outing_rows, "outing_id")
+        if bad_outing_ids:
+            route_links = [link for link in route_links if link["outing_id"] not in bad_outing_ids]
+
+        _insert_ignore(session, Outings, outing_rows)
+
+        existing_route_ids = set(
+            session.scalars(select(Routes.route_id).where(Routes.route_id.in_(referenced_route_ids))).all()
+        )
+        _insert_ignore(
+            session, outings_mapping,
+            [link for link in route_links if link["route_id"] in existing_route_ids],
+        )
+
+        session.commit()
+
+
+def insert_weather_stations_bulk(session: Session, stations: List[dict], batch_size: int = 1000) -> None:
+    """
+    Insert scraped weather-station payloads with Core executemany; parameters
+    are deduplicated by name and linked through the mapping table.
+    """
+    station_cols = {c.name for c in WeatherStation.__table__.columns}
+
+    for chunk in _chunked(stations, batch_size):
+        station_rows: List[dict] = []
+        param_links: List[tuple] = []
+
+        for data in chunk:
+            station_id = data["station_id"]
+            station_row = {k: v for k, v in data.items() if k in station_cols}
+            # scraper payloads don't carry the flag; match insert_weather_station's default
+            station_row.setdefault("of_interest", True)
+            station_rows.append(station_row)
+            for paramData in data.get("station_parameters") or []:
+                param_links.append((station_id, paramData))
+
+        _insert_ignore(session, WeatherStation, station_rows)
+
+        if param_links:
+            names = {paramData["parameter_name"] for _, paramData in param_links}
+            id_map = {
+                p.parameter_name: p.parameter_id
+                for p in session.scalars(select(StationsParameters).where(StationsParameters.parameter_name.in_(names))).all()
+            }
+            missing = {
+                paramData["parameter_name"]: paramData
+                for _, paramData in param_links
+                if paramData["parameter_name"] not in id_map
+            }
+            if missing:
+                session.execute(insert(StationsParameters), list(missing.values()))
+                id_map = {
+                    p.parameter_name: p.parameter_id
+                    for p in session.scalars(select(StationsParameters).where(StationsParameters.parameter_name.in_(names))).all()
+                }
+            _insert_ignore(
+                session, stations_parameters_mapping,
+                [
+                    {"station_id": sid, "parameter_id": id_map[paramData["parameter_name"]]}
+                    for sid, paramData in param_links
+                ],
+            )
+
+        session.commit()
+
+
+def _as_date(value: Optional[datetime.datetime]) -> Optional[datetime.date]:
+    """Normalize datetime arguments to the date granularity stored in db."""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    return value
+
+def load_scraped_routes_ids(engine: Union[Engine, Connection], min_date: Optional[datetime.datetime]) -> Set[int]:
     """Return set of route IDs updated after min_date (or all if None)."""
-    query = "SELECT route_id FROM Routes"
+    query = select(Routes.route_id)
     if min_date:
-        query += " WHERE last_updated >= :min_date AND last_updated IS NOT NULL"
+        query = query.where(Routes.last_updated >= _as_date(min_date), Routes.last_updated.is_not(None))
 
-    route_ids: Set[int] = set()
-    with engine.connect() as conn:
-        result = conn.execute(text(query), {"min_date": min_date.strftime("%Y-%m-%d")} if min_date else {})
-        route_ids = {row.route_id for row in result}
+    # stream in 10k-row batches instead of buffering the whole id column
+    with _connect(engine) as conn:
+        route_ids: Set[int] = set(
+            conn.execute(query.execution_options(stream_results=True, yield_per=10_000)).scalars()
+        )
 
     return route_ids
 
@@ -200,60 +546,82 @@ def load_routes(session: Session, country_id: Optional[int] = None) -> Query:
         .filter(Countries.country_id == country_id)
     )
 
-def load_scraped_outings_ids(engine: Engine, min_date: Optional[datetime.datetime], mode: Literal['update_date', 'outing_date']) -> Set[int]:
+def load_route_coords(engine: Union[Engine, Connection], country_id: Optional[int] = None) -> List[Row]:
+    """
+    Return (route_id, lat, lon, attribution_coord_hash) rows, optionally
+    filtered by country. Plain Core rows: the attribution job only needs the
+    coordinates, not hydrated Routes objects.
+    """
+    query = select(Routes.route_id, Routes.lat, Routes.lon, Routes.attribution_coord_hash)
+    if country_id:
+        query = query.join(Routes.countries).where(Countries.country_id == country_id)
+
+    with _connect(engine) as conn:
+        return conn.execute(query.execution_options(stream_results=True, yield_per=10_000)).all()
+
+def load_scraped_outings_ids(engine: Union[Engine, Connection], min_date: Optional[datetime.datetime], mode: Literal['update_date', 'outing_date']) -> Set[int]:
     """Return set of route IDs updated after min_date, or outings that happened after min_date"""
 
     if mode not in {'update_date', 'outing_date'}:
         raise ValueError("mode must be either 'update_date' or 'outing_date'")
         
-    query = "SELECT outing_id FROM Outings"
+    query = select(Outings.outing_id)
     if min_date: 
         if mode=='update_date':
-            query += " WHERE last_updated >= :min_date AND last_updated IS NOT NULL"
+            query = query.where(Outings.last_updated >= _as_date(min_date), Outings.last_updated.is_not(None))
         else:
-            query += " WHERE date >= :min_date"
+            query = query.where(Outings.date >= _as_date(min_date))
 
-    outings_ids: Set[int] = set()
-    with engine.connect() as conn:
-        result = conn.execute(text(query), {"min_date": min_date.strftime("%Y-%m-%d")} if min_date else {})
-        outings_ids = {row.outing_id for row in result}
+    with _connect(engine) as conn:
+        outings_ids: Set[int] = set(
+            conn.execute(query.execution_options(stream_results=True, yield_per=10_000)).scalars()
+        )
 
     return outings_ids
 
-def get_last_outing_date(engine: Engine) -> datetime.datetime:
+def get_last_outing_date(engine: Union[Engine, Connection]) -> datetime.date:
     """Return the date of the most recent outing in db"""
-    query = "SELECT MAX(date) FROM Outings"
+    query = select(func.max(Outings.date))
 
-    with engine.connect() as conn:
-        result_str = conn.execute(text(query)).scalar_one()
-        result = datetime.datetime.strptime(result_str, "%Y-%m-%d")
-        
-    return result
+    with _connect(engine) as conn:
+        result = conn.execute(query).scalar_one()
 
-def check_route_existence(engine: Engine, route_id: int) -> bool:
-    """Checks whether the route exists in db"""
-    query = "SELECT route_id FROM Routes WHERE route_id = :route_id"
+    return result
 
-    with engine.connect() as conn:
-        route = conn.execute(text(query), {"route_id": route_id})
+# Hot statements built once at import so the per-call cost is just execution,
+# not re-parsing SQL strings.
+_SQL_ROUTE_EXISTS = text("SELECT EXISTS(SELECT 1 FROM Routes WHERE route_id = :route_id)")
+_SQL_OUTING_EXISTS = text("SELECT EXISTS(SELECT 1 FROM Outings WHERE outing_id = :outing_id)")
 
-    result = route.first() is not None
+def check_route_existence(engine: Union[Engine, Connection], route_id: int) -> bool:
+    """Checks whether the route exists in db"""
+    with _connect(engine) as conn:
+        result = bool(conn.execute(_SQL_ROUTE_EXISTS, {"route_id": route_id}).scalar())
 
     return result
 
-def check_outing_existence(engine: Engine, outing_id: int) -> bool:
-
+def check_outing_existence(engine: Union[Engine, Connection], outing_id: int) -> bool:
     """Checks whether the outing exists in db"""
-    query = "SELECT outing_id FROM Outings WHERE outing_id = :outing_id"
-
-    outings_ids: Set[int] = set()
-    with engine.connect() as conn:
-        result = conn.execute(text(query), {"outing_id": outing_id})
-        outings_ids = {row.outing_id for row in result}
+    with _connect(engine) as conn:
+        result = bool(conn.execute(_SQL_OUTING_EXISTS, {"outing_id": outing_id}).scalar())
 
-    result = (len(outings_ids)>0)
     return result
 
+def check_routes_exist(engine: Union[Engine, Connection], route_ids) -> Set[int]:
+    """
+    Bulk variant of check_route_existence: return the subset of route_ids
+    already in db, in a single IN query instead of one round-trip per id.
+    """
+    route_ids = list(route_ids)
+    if not route_ids:
+        return set()
+
+    with _connect(engine) as conn:
+        result = conn.execute(
+            select(Routes.route_id).where(Routes.route_id.in_(route_ids))
+        )
+        return set(result.scalars())
+
 # -----------------------
 # Weather data
 # -----------------------
@@ -271,23 +639,21 @@ def insert_weather_station(session: Session,
                            lon: float,
                            last_updated:datetime.datetime,
                            of_interest: bool = True,
-                           station_parameters: List = [],
-                           routes: List = [],
+                           station_parameters: Optional[List] = None,
+                           routes: Optional[List] = None,
                            commit: bool = True) -> None:
 
     """
     Adding a weather station
     """
 
-    # Retrieving parameters 
-    stationParamsList: List[StationsParameters] = []
-    for paramData in station_parameters:
-        stationParamsList.append(get_weather_station_parameter(session, paramData))
-
-    # Retrieving associated routes 
-    routesList: List[Routes] = []
-    for routeData in routes:
-        stationParamsList.append(get_route(session, routeData))
+    # Retrieving parameters and associated routes, one IN-prefetch per relation.
+    # (Routes used to be appended to the parameters list by mistake, corrupting
+    # the relationship and wasting one SELECT per route.)
+    stationParamsList: List[StationsParameters] = get_objs_bulk(
+        StationsParameters, "parameter_name", session, list(station_parameters or ())
+    )
+    routesList: List[Routes] = get_objs_bulk(Routes, "route_id", session, list(routes or ()))
 
     station = WeatherStation(
         station_id=station_id,
@@ -311,7 +677,8 @@ def insert_weather_station_parameter(session: Session,
                                      parameter_name: str,
                                      last_updated:datetime.datetime,
                                      parameter_id: int | None = None,
-                                     stations: List = []
+                                     stations: Optional[List] = None,
+                                     commit: bool = True
                                      ) -> None:
 
     """
@@ -319,9 +686,7 @@ def insert_weather_station_parameter(session: Session,
     """
 
     # Retrieving stations 
-    stationsList: List[WeatherStation] = []
-    for stationData in stations:
-        stationsList.append(get_weather_station(session, stationData))
+    stationsList: List[WeatherStation] = [get_weather_station(session, stationData) for stationData in stations or ()]
 
     param = StationsParameters(
         parameter_name=parameter_name,
@@ -331,25 +696,47 @@ def insert_weather_station_parameter(session: Session,
      )
     
     session.add(param)
-    session.commit()
+    if commit:
+        session.commit()
 
-def load_scraped_stations_ids(engine: Engine) -> Set[str]:
-    """Return set of stations IDs already in db."""
-    query = "SELECT station_id FROM weather_stations"
+_SQL_STATION_IDS = text("SELECT station_id FROM weather_stations").execution_options(
+    stream_results=True, yield_per=10_000
+)
 
-    stations_ids: Set[str] = set()
-    with engine.connect() as conn:
-        result = conn.execute(text(query))
-        stations_ids = {str(row.station_id) for row in result}
+def load_scraped_stations_ids(engine: Union[Engine, Connection]) -> Set[str]:
+    """Return set of stations IDs already in db."""
+    with _connect(engine) as conn:
+        result = conn.execute(_SQL_STATION_IDS)
+        stations_ids: Set[str] = {str(station_id) for station_id in result.scalars()}
 
     return stations_ids
 
-def load_stations(engine: Engine) -> CursorResult[WeatherStation]:
-    """Return weather stations in db."""
-    query = "SELECT * FROM weather_stations"
+_SQL_STATIONS = text("SELECT * FROM weather_stations").execution_options(stream_results=True, yield_per=1000)
 
-    with engine.connect() as conn:
-        result = conn.execute(text(query))
+def load_stations(engine: Union[Engine, Connection]) -> Iterator[Row]:
+    """
+    Yield weather station rows lazily under an open connection.
 
-    return result
+    The previous version returned the CursorResult after its connection had
+    been closed, so iterating it was broken; streaming also keeps memory
+    bounded instead of buffering the whole table.
+    """
+    with _connect(engine) as conn:
+        yield from conn.execute(_SQL_STATIONS)
+
+_SQL_STATIONS_NP = text("SELECT station_id, lat, lon FROM weather_stations")
+
+def load_stations_np(engine: Union[Engine, Connection]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Return station ids plus lat/lon as contiguous NumPy arrays (SoA layout).
+    Cheaper than materializing ORM objects for the numeric attribution workloads.
+    """
+    with _connect(engine) as conn:
+        rows = conn.execute(_SQL_STATIONS_NP).all()
+
+    station_ids = [row.station_id for row in rows]
+    lats = np.array([row.lat for row in rows], dtype=np.float64)
+    lons = np.array([row.lon for row in rows], dtype=np.float64)
+
+    return station_ids, lats, lons
 
@@ -1,6 +1,6 @@
 from typing import List
 import datetime as dt
-from sqlalchemy import ForeignKey, Table, Column, Integer, String, Time
+from sqlalchemy import Date, ForeignKey, Index, Table, Column, Integer, String, Time
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -29,23 +29,34 @@ class Routes(Base):
     global_rating=Column(String, nullable=True) 
     ice_rating=Column(String, nullable=True) 
     mixed_rating=Column(String, nullable=True) 
-    rock_free_rating=Column(String, nullable=True) 
-    last_updated=Column(String, nullable=True) 
-
+    rock_free_rating=Column(String, nullable=True)
+    # native Date (not String) so filters bind and compare without strptime/strftime;
+    # indexed: the incremental scrape filters on last_updated
+    last_updated=Column(Date, nullable=True, index=True)
+    # hash of (lat, lon) at the time stations were last attributed; lets update runs
+    # skip routes whose coordinates did not change (see weather_stations_attribution)
+    attribution_coord_hash=Column(String, nullable=True)
+
+    # lazy="selectin" batches each collection into one IN query per Routes
+    # result set instead of one lazy SELECT per route on first access
     orientations: Mapped[List["Orientations"]] = relationship(
         secondary="orientation_mapping", #For a many-to-many relationship, specifies the intermediary table, and is typically an instance of Table
+        lazy="selectin",
     )
 
     countries: Mapped[List["Countries"]] = relationship(
         secondary="countries_mapping", 
+        lazy="selectin",
     )
 
     outings: Mapped[List["Outings"]] = relationship(
-        secondary="outings_mapping", back_populates='routes'
+        secondary="outings_mapping", back_populates='routes',
+        lazy="selectin",
     )
 
     stations: Mapped[List["WeatherStation"]] = relationship(
-            secondary="route_stations_mapping", back_populates='routes'
+            secondary="route_stations_mapping", back_populates='routes',
+            lazy="selectin",
         )
     
     def __repr__(self):
@@ -69,6 +80,9 @@ countries_mapping = Table(
     Column("country_id", ForeignKey("countries.country_id"), primary_key=True),
 )
 
+# the composite PK only covers lookups by route_id; load_routes filters by country
+Index("ix_countries_mapping_country_id", countries_mapping.c.country_id)
+
 outings_mapping = Table(
     "outings_mapping",
     Base.metadata,
@@ -76,6 +90,9 @@ outings_mapping = Table(
     Column("outing_id", ForeignKey("outings.outing_id"), primary_key=True),
 )
 
+# reverse lookup (outing -> routes); the composite PK only covers route_id first
+Index("ix_outings_mapping_outing_id", outings_mapping.c.outing_id)
+
 class Countries(Base):
     __tablename__ = "countries"
 
@@ -98,9 +115,11 @@ class Outings(Base):
     __tablename__ = "outings"
 
     outing_id: Mapped[int] = mapped_column(primary_key=True)
-    date: Mapped[str] 
+    # both native Date and indexed: incremental scrapes filter on them and
+    # get_last_outing_date takes MAX(date)
+    date: Mapped[dt.date] = mapped_column(index=True)
     conditions=Column(String, nullable=True) 
-    last_updated=Column(String, nullable=True) 
+    last_updated=Column(Date, nullable=True, index=True) 
     
     routes: Mapped[List["Routes"]] = relationship(
         secondary="outings_mapping", back_populates='outings'
@@ -161,6 +180,9 @@ stations_parameters_mapping = Table(
     Column("parameter_id", ForeignKey("stations_parameters.parameter_id"), primary_key=True),
 )
 
+# reverse lookup (parameter -> stations)
+Index("ix_stations_parameters_mapping_parameter_id", stations_parameters_mapping.c.parameter_id)
+
 # -----------------------
 # Link table
 # -----------------------
@@ -172,3 +194,6 @@ route_stations_mapping = Table(
     Column("route_id", ForeignKey("routes.route_id"), primary_key=True),
 )
 
+# reverse lookup (route -> stations), used when reading Routes.stations
+Index("ix_route_stations_mapping_route_id", route_stations_mapping.c.route_id)
+
@@ -1,3 +1,22 @@
-from willthisfreeze.scraper.c2c_scraper import C2CScraper
-from willthisfreeze.scraper.meteofrance_scraper import MFScraper
-from willthisfreeze.scraper.weather_stations_attribution import weather_stations_attribution
\ No newline at end of file
+# Lazy re-exports (PEP 562): importing one scraper must not pay for the
+# others' dependencies (pandas/pyproj for MF, scipy for attribution, ...).
+_EXPORTS = {
+    "C2CScraper": "willthisfreeze.scraper.c2c_scraper",
+    "MFScraper": "willthisfreeze.scraper.meteofrance_scraper",
+    "weather_stations_attribution": "willthisfreeze.scraper.weather_stations_attribution",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        import importlib
+
+        module = importlib.import_module(_EXPORTS[name])
+        obj = getattr(module, name)
+        # weather_stations_attribution names both a submodule and a function,
+        # and importing the submodule just bound the module as a package
+        # attribute, shadowing this hook. Rebind the resolved object so every
+        # later lookup gets the callable, not the module.
+        globals()[name] = obj
+        return obj
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,36 +1,52 @@
+import asyncio
 import logging
 import datetime
 import requests
-import multiprocessing
 import time
 from sys import stdout
 import math
-from functools import partial
 from typing import Literal, Optional, Set, Dict, List, Any
 
+import aiohttp
+import orjson
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
 from tqdm import tqdm
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy import create_engine, Engine
+from sqlalchemy import Engine
 
 from willthisfreeze.dbutils import (
-    insert_route,
-    insert_outing,
+    insert_routes_bulk,
+    insert_outings_bulk,
     load_scraped_outings_ids,
     load_scraped_routes_ids,
-    check_route_existence,
+    check_routes_exist,
+    get_engine,
     get_last_outing_date,
 )
 
 from willthisfreeze.scraper.utils import (
     get_countries_list,
     get_geo_coordinates,
+    get_http_session,
     get_title,
+    retry_after_seconds,
 )
 
 disable_tqdm = not stdout.isatty()
 logger = logging.getLogger(__name__)
 
+
+def _parse_iso_date(value: Optional[str]) -> Optional[datetime.date]:
+    """Parse the YYYY-MM-DD dates of the C2C API into the native dates stored in db."""
+    return datetime.date.fromisoformat(value) if value else None
+
+
+# activity flags mirrored onto Routes columns, resolved with one hash lookup each
+_ACTIVITY_FLAGS = ("snow_ice_mixed", "mountain_climbing", "ice_climbing")
+
+
 # An iterable that loops over the pages of an api call, be it routes or outings so that it can be iterated over
 class C2CApiCallIterator:
     def __init__(
@@ -51,6 +67,10 @@ class C2CApiCallIterator:
         self.current_loop = 1
         assert 0 < self.results_per_page <= 100
 
+        # single-slot pipeline: page K+1 is fetched while the consumer works on K
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._inflight: Optional[Future] = None
+
         logger.info("c2c.api.iterator.start", extra={"url": self.api_call_adress, "limit": self.results_per_page})
 
     def _update_num_iter_loops(self, callresult: dict) -> None:
@@ -69,16 +89,19 @@ class C2CApiCallIterator:
         last_exc: Exception | None = None
         for attempt in range(1, self.max_retries + 1):
             t0 = time.time()
+            wait_s = self.backoff_s * (2 ** (attempt - 1))
             try:
-                resp = requests.get(self.api_call_adress, params=params, timeout=self.timeout_s)
+                resp = get_http_session().get(self.api_call_adress, params=params, timeout=self.timeout_s)
                 dt_ms = int((time.time() - t0) * 1000)
 
                 if resp.status_code == 200:
                     logger.debug("c2c.api.page", extra={**params, "url": self.api_call_adress, "page": page, "status_code": 200, "attempt": attempt, "duration_ms": dt_ms})
                     return resp
 
-                # Retry on 429 / 5xx
+                # Retry on 429 / 5xx, honoring Retry-After when the server sends one
                 if resp.status_code == 429 or 500 <= resp.status_code < 600:
+                    if resp.status_code == 429:
+                        wait_s = retry_after_seconds(resp.headers, fallback=wait_s)
                     logger.warning(
                         "c2c.api.retryable_status",
                         extra={**params, "url": self.api_call_adress, "page": page, "status_code": resp.status_code, "attempt": attempt, "duration_ms": dt_ms},
@@ -101,31 +124,118 @@ class C2CApiCallIterator:
                 )
 
             # backoff before next attempt
-            time.sleep(self.backoff_s * (2 ** (attempt - 1)))
+            time.sleep(wait_s)
 
         assert last_exc is not None
         logger.error("c2c.api.give_up", extra={**params, "url": self.api_call_adress, "page": page, "retries": self.max_retries})
         raise last_exc
 
+    def _page_params(self, page: int) -> dict:
+        return {"offset": (page - 1) * self.results_per_page, "limit": self.results_per_page}
+
+    def _submit_prefetch(self) -> None:
+        """Start fetching the next page in the background, hiding its RTT."""
+        if self.current_loop > self.num_iter_loops:
+            return
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=1)
+        self._inflight = self._pool.submit(self._get_with_retries, self._page_params(self.current_loop), self.current_loop)
+
     def __next__(self):
         if self.current_loop > self.num_iter_loops:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
             logger.info("c2c.api.iterator.done", extra={"url": self.api_call_adress, "pages": self.num_iter_loops})
             raise StopIteration
 
-        offset = (self.current_loop - 1) * self.results_per_page
-        params = {"offset": offset, "limit": self.results_per_page}
-
-        resp = self._get_with_retries(params=params, page=self.current_loop)
-        callresult = resp.json()
+        page = self.current_loop
+        if self._inflight is not None:
+            resp = self._inflight.result()
+            self._inflight = None
+        else:
+            resp = self._get_with_retries(params=self._page_params(page), page=page)
+        callresult = orjson.loads(resp.content)
 
-        if self.current_loop == 1:
+        if page == 1:
             self._update_num_iter_loops(callresult)
 
         self.current_loop += 1
+        self._submit_prefetch()
         return callresult
 
 
 
+async def async_get_json(
+    http: aiohttp.ClientSession,
+    url: str,
+    params: Optional[dict] = None,
+    timeout_s: float = 30.0,
+    max_retries: int = 3,
+    backoff_s: float = 1.0,
+) -> dict:
+    """
+    GET a JSON payload with the same retry policy as C2CApiCallIterator:
+    retry on 429/5xx and on transport errors, exponential backoff, raise after max_retries.
+    """
+    last_exc: Exception | None = None
+    for attempt in range(1, max_retries + 1):
+        wait_s = backoff_s * (2 ** (attempt - 1))
+        try:
+            async with http.get(url, params=params, timeout=aiohttp.ClientTimeout(total=timeout_s)) as resp:
+                if resp.status == 200:
+                    # orjson decodes the multi-KB payloads several times faster
+                    # than the stdlib parser aiohttp would use
+                    return orjson.loads(await resp.read())
+
+                if resp.status == 429 or 500 <= resp.status < 600:
+                    if resp.status == 429:
+                        wait_s = retry_after_seconds(resp.headers, fallback=wait_s)
+                    last_exc = aiohttp.ClientResponseError(
+                        resp.request_info, resp.history, status=resp.status, message=resp.reason or ""
+                    )
+                else:
+                    resp.raise_for_status()
+
+        except Exception as e:
+            last_exc = e
+
+        await asyncio.sleep(wait_s)
+
+    assert last_exc is not None
+    raise last_exc
+
+
+async def async_get_all_pages(
+    http: aiohttp.ClientSession,
+    api_call_adress: str,
+    results_per_page: int = 100,
+    timeout_s: float = 30.0,
+) -> List[dict]:
+    """Drain a paginated C2C listing endpoint, returning the concatenated documents."""
+    documents: List[dict] = []
+    offset = 0
+    total: Optional[int] = None
+
+    while total is None or offset < total:
+        payload = await async_get_json(
+            http,
+            api_call_adress,
+            params={"offset": offset, "limit": results_per_page},
+            timeout_s=timeout_s,
+        )
+        if total is None:
+            total = payload.get("total", 0)
+
+        docs = payload.get("documents", []) or []
+        documents.extend(docs)
+        if not docs:
+            break
+        offset += results_per_page
+
+    return documents
+
+
 class C2CScraper:
     def __init__(
         self,
@@ -139,7 +249,7 @@ class C2CScraper:
             raise ValueError("mode must be either 'init' or 'update'")
 
         self.config = config
-        self.update_date = datetime.datetime.now().strftime("%Y-%m-%d")
+        self.update_date = datetime.date.today()
 
         self.dbstring: str = dbstring
         self.parallel: bool = self.mode in config["parallel"]
@@ -149,6 +259,13 @@ class C2CScraper:
         self.scraping_params: Dict[str, Any] = config.get("c2c_scraper_parameters", {})
         self.update_date_start = update_date_start
 
+        # resolved once so the per-activity loops don't re-read the config dict
+        self.routes_url: str = self.scraping_params.get("routes_url", "")
+        self.outings_url: str = self.scraping_params.get("outings_url", "")
+        self.routes_filter: str = self.scraping_params.get("routes_filter", "")
+        self.activities_filter: str = self.scraping_params.get("activities_filter", "")
+        self.outings_date_filter: str = self.scraping_params.get("outings_date_filter", "")
+
         logger.info(
             "c2c.init",
             extra={
@@ -173,9 +290,10 @@ class C2CScraper:
         outings_url: str = "",
         routes_filter: str = "",
         already_scraped_ids: Optional[Set[int]] = None,
-        update_date: str = datetime.datetime.now().strftime("%Y-%m-%d"),
+        update_date: Optional[datetime.date] = None,
         force_api_call: bool = False,
         get_full_title: bool = True,
+        fetch_outings: bool = True,
         request_timeout_s: float = 30.0,
     ) -> dict:
         """
@@ -184,13 +302,25 @@ class C2CScraper:
         Prefer returning error info rather than logging heavily inside workers.
         """
         already_scraped_ids = already_scraped_ids or set()
+        update_date = update_date or datetime.date.today()
         t0 = time.time()
 
         try:
+            # resolve the id before any HTTP: a skipped document must not
+            # cost a round-trip whose result is thrown away
+            route_id = route_id or (routeData or {}).get("document_id")
+            if route_id in already_scraped_ids:
+                return {"route_id": route_id, "skipped": True, "routeInfo": {}}
+
+            # track whether routeData came from the detail endpoint, so the
+            # title extraction below can reuse it instead of re-fetching
+            has_detail_doc = False
+
             if route_id and routeData is None:
-                r = requests.get(f"{routes_url}/{route_id}", timeout=request_timeout_s)
+                r = get_http_session().get(f"{routes_url}/{route_id}", timeout=request_timeout_s)
                 r.raise_for_status()
-                routeData = r.json()
+                routeData = orjson.loads(r.content)
+                has_detail_doc = True
 
             if not isinstance(routeData, dict) or not routeData:
                 raise ValueError("Must provide either route_id or routeData")
@@ -199,52 +329,59 @@ class C2CScraper:
             if not route_id:
                 raise ValueError("Route ID could not be determined")
 
-            if force_api_call:
-                r = requests.get(f"{routes_url}/{route_id}", timeout=request_timeout_s)
+            # built once per worker call; reused by the refetch and title paths
+            route_detail_url = f"{routes_url}/{route_id}"
+
+            if force_api_call and not has_detail_doc:
+                r = get_http_session().get(route_detail_url, timeout=request_timeout_s)
                 r.raise_for_status()
-                routeData = r.json()
+                routeData = orjson.loads(r.content)
+                has_detail_doc = True
                 if not isinstance(routeData, dict) or not routeData:
                     raise ValueError(f"Couldn't scrape route data for route_id={route_id}")
 
-            if route_id in already_scraped_ids:
-                return {"route_id": route_id, "skipped": True, "routeInfo": {}}
-
-            call_address = f"{outings_url}?{routes_filter}{route_id}"
-            outingsIterator = C2CApiCallIterator(api_call_adress=call_address, results_per_page=100)
-
-            associated_outings = [
-                {
-                    "outing_id": outing["document_id"],
-                    "date": outing["date_start"],
-                    "conditions": outing.get("condition_rating", None),
-                    "last_updated": update_date,
-                }
-                for outinglist in outingsIterator
-                for outing in outinglist.get("documents", [])
-            ]
+            if fetch_outings:
+                call_address = f"{outings_url}?{routes_filter}{route_id}"
+                outingsIterator = C2CApiCallIterator(api_call_adress=call_address, results_per_page=100)
+
+                associated_outings = [
+                    {
+                        "outing_id": outing["document_id"],
+                        "date": _parse_iso_date(outing["date_start"]),
+                        "conditions": outing.get("condition_rating", None),
+                        "last_updated": update_date,
+                    }
+                    for outinglist in outingsIterator
+                    for outing in outinglist.get("documents", [])
+                ]
+            else:
+                # update-mode recovery: the outing history is scraped by the
+                # update loop itself, no need to paginate it here
+                associated_outings = []
 
             if get_full_title:
-                r = requests.get(f"{routes_url}/{route_id}", timeout=request_timeout_s)
-                r.raise_for_status()
-                fullrouteData = r.json()
-                if not isinstance(fullrouteData, dict) or not fullrouteData:
-                    raise ValueError(f"Couldn't scrape full title data for route_id={route_id}")
-                title = get_title(fullrouteData)
+                # the title lives in the detail document; only fetch it when we
+                # still hold the shallow listing payload
+                if not has_detail_doc:
+                    r = get_http_session().get(route_detail_url, timeout=request_timeout_s)
+                    r.raise_for_status()
+                    routeData = orjson.loads(r.content)
+                    if not isinstance(routeData, dict) or not routeData:
+                        raise ValueError(f"Couldn't scrape full title data for route_id={route_id}")
+                title = get_title(routeData)
             else:
                 title = ""
 
             lon, lat = get_geo_coordinates(routeData)
             countries = get_countries_list(routeData)
-            activities = routeData.get("activities", []) or []
+            activities = frozenset(routeData.get("activities") or ())
 
             route_info = {
                 "route_id": route_id,
                 "name": title,
                 "lat": lat,
                 "lon": lon,
-                "snow_ice_mixed": 1 if "snow_ice_mixed" in activities else None,
-                "mountain_climbing": 1 if "mountain_climbing" in activities else None,
-                "ice_climbing": 1 if "ice_climbing" in activities else None,
+                **{flag: (1 if flag in activities else None) for flag in _ACTIVITY_FLAGS},
                 "elevation_min": routeData.get("elevation_min", None),
                 "elevation_max": routeData.get("elevation_max", None),
                 "difficulties_height": routeData.get("difficulties_height", None),
@@ -283,18 +420,30 @@ class C2CScraper:
         outing_id: Optional[int] = None,
         outings_url: str = "",
         already_scraped_ids: Optional[Set[int]] = None,
-        update_date: str = datetime.datetime.now().strftime("%Y-%m-%d"),
+        update_date: Optional[datetime.date] = None,
         force_api_call: bool = True,
         request_timeout_s: float = 30.0,
     ) -> dict:
         already_scraped_ids = already_scraped_ids or set()
+        update_date = update_date or datetime.date.today()
         t0 = time.time()
 
         try:
+            # resolve the id before any HTTP: a skipped document must not
+            # cost a round-trip whose result is thrown away
+            outing_id = outing_id or (outingData or {}).get("document_id")
+            if outing_id in already_scraped_ids:
+                return {"outing_id": outing_id, "skipped": True, "outingInfo": {}}
+
+            # like the route worker, remember when outingData already came from
+            # the detail endpoint so force_api_call doesn't refetch the same URL
+            has_detail_doc = False
+
             if outing_id and outingData is None:
-                r = requests.get(f"{outings_url}/{outing_id}", timeout=request_timeout_s)
+                r = get_http_session().get(f"{outings_url}/{outing_id}", timeout=request_timeout_s)
                 r.raise_for_status()
-                outingData = r.json()
+                outingData = orjson.loads(r.content)
+                has_detail_doc = True
 
             if not isinstance(outingData, dict) or not outingData:
                 raise ValueError("Must provide either outing_id or outingData")
@@ -303,22 +452,202 @@ class C2CScraper:
             if not outing_id:
                 raise ValueError("Outing ID could not be determined")
 
-            if force_api_call:
-                r = requests.get(f"{outings_url}/{outing_id}", timeout=request_timeout_s)
+            if force_api_call and not has_detail_doc:
+                r = get_http_session().get(f"{outings_url}/{outing_id}", timeout=request_timeout_s)
                 r.raise_for_status()
-                outingData = r.json()
+                outingData = orjson.loads(r.content)
                 if not isinstance(outingData, dict) or not outingData:
                     raise ValueError(f"Couldn't scrape outing data for outing_id={outing_id}")
 
+            routes = outingData.get("associations", {}).get("routes", []) or []
+            routeList = [{"route_id": r["document_id"]} for r in routes]
+
+            outing_info = {
+                "outing_id": outing_id,
+                "date": _parse_iso_date(outingData.get("date_start")),
+                "conditions": outingData.get("condition_rating"),
+                "last_updated": update_date,
+                "routes": routeList,
+            }
+
+            return {
+                "outing_id": outing_id,
+                "skipped": False,
+                "outingInfo": outing_info,
+                "duration_ms": int((time.time() - t0) * 1000),
+            }
+
+        except Exception as e:
+            return {
+                "outing_id": outing_id,
+                "skipped": False,
+                "outingInfo": {},
+                "error": str(e),
+                "duration_ms": int((time.time() - t0) * 1000),
+            }
+
+    @staticmethod
+    async def scrape_route_async(
+        http: aiohttp.ClientSession,
+        routeData: Optional[dict] = None,
+        route_id: Optional[int] = None,
+        routes_url: str = "",
+        outings_url: str = "",
+        routes_filter: str = "",
+        already_scraped_ids: Optional[Set[int]] = None,
+        update_date: Optional[datetime.date] = None,
+        force_api_call: bool = False,
+        get_full_title: bool = True,
+        fetch_outings: bool = True,
+        request_timeout_s: float = 30.0,
+    ) -> dict:
+        """Async counterpart of scrape_route sharing one aiohttp session across workers."""
+        already_scraped_ids = already_scraped_ids or set()
+        update_date = update_date or datetime.date.today()
+        t0 = time.time()
+
+        try:
+            # resolve the id before any HTTP: a skipped document must not
+            # cost a round-trip whose result is thrown away
+            route_id = route_id or (routeData or {}).get("document_id")
+            if route_id in already_scraped_ids:
+                return {"route_id": route_id, "skipped": True, "routeInfo": {}}
+
+            # same detail-document tracking as the sync worker
+            has_detail_doc = False
+
+            if route_id and routeData is None:
+                routeData = await async_get_json(http, f"{routes_url}/{route_id}", timeout_s=request_timeout_s)
+                has_detail_doc = True
+
+            if not isinstance(routeData, dict) or not routeData:
+                raise ValueError("Must provide either route_id or routeData")
+
+            route_id = routeData.get("document_id", route_id)
+            if not route_id:
+                raise ValueError("Route ID could not be determined")
+
+            route_detail_url = f"{routes_url}/{route_id}"
+
+            if force_api_call and not has_detail_doc:
+                routeData = await async_get_json(http, route_detail_url, timeout_s=request_timeout_s)
+                has_detail_doc = True
+                if not isinstance(routeData, dict) or not routeData:
+                    raise ValueError(f"Couldn't scrape route data for route_id={route_id}")
+
+            if fetch_outings:
+                call_address = f"{outings_url}?{routes_filter}{route_id}"
+                outing_docs = await async_get_all_pages(http, call_address, results_per_page=100, timeout_s=request_timeout_s)
+
+                associated_outings = [
+                    {
+                        "outing_id": outing["document_id"],
+                        "date": _parse_iso_date(outing["date_start"]),
+                        "conditions": outing.get("condition_rating", None),
+                        "last_updated": update_date,
+                    }
+                    for outing in outing_docs
+                ]
+            else:
+                associated_outings = []
+
+            if get_full_title:
+                if not has_detail_doc:
+                    routeData = await async_get_json(http, route_detail_url, timeout_s=request_timeout_s)
+                    if not isinstance(routeData, dict) or not routeData:
+                        raise ValueError(f"Couldn't scrape full title data for route_id={route_id}")
+                title = get_title(routeData)
+            else:
+                title = ""
+
+            lon, lat = get_geo_coordinates(routeData)
+            countries = get_countries_list(routeData)
+            activities = frozenset(routeData.get("activities") or ())
+
+            route_info = {
+                "route_id": route_id,
+                "name": title,
+                "lat": lat,
+                "lon": lon,
+                **{flag: (1 if flag in activities else None) for flag in _ACTIVITY_FLAGS},
+                "elevation_min": routeData.get("elevation_min", None),
+                "elevation_max": routeData.get("elevation_max", None),
+                "difficulties_height": routeData.get("difficulties_height", None),
+                "height_diff_difficulties": routeData.get("height_diff_difficulties", None),
+                "orientations": routeData.get("orientations", []) or [],
+                "glacier": routeData.get("glacier_gear", None),
+                "global_rating": routeData.get("global_rating", None),
+                "ice_rating": routeData.get("ice_rating", None),
+                "mixed_rating": routeData.get("mixed_rating", None),
+                "rock_free_rating": routeData.get("rock_free_rating", None),
+                "outings": associated_outings,
+                "countries": countries,
+                "last_updated": update_date,
+            }
+
+            return {
+                "route_id": route_id,
+                "skipped": False,
+                "routeInfo": route_info,
+                "duration_ms": int((time.time() - t0) * 1000),
+            }
+
+        except Exception as e:
+            return {
+                "route_id": route_id,
+                "skipped": False,
+                "routeInfo": {},
+                "error": str(e),
+                "duration_ms": int((time.time() - t0) * 1000),
+            }
+
+    @staticmethod
+    async def scrape_outing_async(
+        http: aiohttp.ClientSession,
+        outingData: Optional[dict] = None,
+        outing_id: Optional[int] = None,
+        outings_url: str = "",
+        already_scraped_ids: Optional[Set[int]] = None,
+        update_date: Optional[datetime.date] = None,
+        force_api_call: bool = True,
+        request_timeout_s: float = 30.0,
+    ) -> dict:
+        """Async counterpart of scrape_outing sharing one aiohttp session across workers."""
+        already_scraped_ids = already_scraped_ids or set()
+        update_date = update_date or datetime.date.today()
+        t0 = time.time()
+
+        try:
+            # resolve the id before any HTTP: a skipped document must not
+            # cost a round-trip whose result is thrown away
+            outing_id = outing_id or (outingData or {}).get("document_id")
             if outing_id in already_scraped_ids:
                 return {"outing_id": outing_id, "skipped": True, "outingInfo": {}}
 
+            has_detail_doc = False
+
+            if outing_id and outingData is None:
+                outingData = await async_get_json(http, f"{outings_url}/{outing_id}", timeout_s=request_timeout_s)
+                has_detail_doc = True
+
+            if not isinstance(outingData, dict) or not outingData:
+                raise ValueError("Must provide either outing_id or outingData")
+
+            outing_id = outingData.get("document_id", outing_id)
+            if not outing_id:
+                raise ValueError("Outing ID could not be determined")
+
+            if force_api_call and not has_detail_doc:
+                outingData = await async_get_json(http, f"{outings_url}/{outing_id}", timeout_s=request_timeout_s)
+                if not isinstance(outingData, dict) or not outingData:
+                    raise ValueError(f"Couldn't scrape outing data for outing_id={outing_id}")
+
             routes = outingData.get("associations", {}).get("routes", []) or []
             routeList = [{"route_id": r["document_id"]} for r in routes]
 
             outing_info = {
                 "outing_id": outing_id,
-                "date": outingData.get("date_start"),
+                "date": _parse_iso_date(outingData.get("date_start")),
                 "conditions": outingData.get("condition_rating"),
                 "last_updated": update_date,
                 "routes": routeList,
@@ -340,6 +669,113 @@ class C2CScraper:
                 "duration_ms": int((time.time() - t0) * 1000),
             }
 
+    async def _scrape_batches_async(
+        self,
+        callIterator: "C2CApiCallIterator",
+        target: Literal["outings", "routes"],
+        worker_kwargs: dict,
+        activity: str,
+    ) -> List[dict]:
+        """
+        Drain the paginated listing and scrape each page's documents concurrently
+        over a single aiohttp session, bounded by a semaphore.
+        """
+        concurrency = self.num_processes if self.parallel else 1
+        sem = asyncio.Semaphore(concurrency)
+        worker_coro = self.scrape_route_async if target == "routes" else self.scrape_outing_async
+
+        final: List[dict] = []
+        connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=30, enable_cleanup_closed=True)
+        async with aiohttp.ClientSession(connector=connector) as http:
+
+            # Open the TLS session before the first batch so short update scrapes
+            # don't spend their first seconds on a serial handshake ramp-up.
+            warmup_url = self.scraping_params.get("base_url")
+            if warmup_url:
+                try:
+                    async with http.head(warmup_url, timeout=aiohttp.ClientTimeout(total=10)):
+                        pass
+                except Exception:
+                    pass
+
+            async def scrape_one(doc: dict) -> dict:
+                async with sem:
+                    return await worker_coro(http, doc, **worker_kwargs)
+
+            batch_i = 0
+            while True:
+                # pagination stays on the sync iterator; run it in a thread so the loop keeps breathing
+                try:
+                    payload = await asyncio.to_thread(next, callIterator)
+                except StopIteration:
+                    break
+
+                docs = payload.get("documents", []) or []
+                t0 = time.time()
+
+                # Pre-filter against the scraped-id set here instead of inside the
+                # workers: a skipped doc then costs a set lookup, not a scheduled
+                # task (and, for force_api_call outings, a whole GET).
+                already_scraped = worker_kwargs.get("already_scraped_ids") or frozenset()
+                id_key = "route_id" if target == "routes" else "outing_id"
+                kept_docs = [doc for doc in docs if doc.get("document_id") not in already_scraped]
+                results = [
+                    {id_key: doc.get("document_id"), "skipped": True}
+                    for doc in docs
+                    if doc.get("document_id") in already_scraped
+                ]
+
+                logger.info(
+                    "c2c.batch.start",
+                    extra={
+                        "activity": activity,
+                        "target": target,
+                        "batch": batch_i,
+                        "batch_size": len(docs),
+                        "prefiltered": len(docs) - len(kept_docs),
+                    },
+                )
+
+                # create_task starts every worker immediately; the semaphore alone gates concurrency
+                tasks = [asyncio.create_task(scrape_one(doc)) for doc in kept_docs]
+                results.extend(await asyncio.gather(*tasks))
+
+                # Debug hard-stop
+                if self.debug_mode and batch_i > 1:
+                    logger.warning("c2c.debug_stop", extra={"activity": activity, "target": target, "batch": batch_i})
+                    final.extend(results)
+                    break
+
+                # Summarize errors (don’t spam stack traces)
+                errors = [r for r in results if r.get("error")]
+                if errors:
+                    logger.warning(
+                        "c2c.batch.errors",
+                        extra={
+                            "activity": activity,
+                            "target": target,
+                            "batch": batch_i,
+                            "error_count": len(errors),
+                            "sample_error": errors[0].get("error"),
+                        },
+                    )
+
+                final.extend(results)
+
+                logger.info(
+                    "c2c.batch.done",
+                    extra={
+                        "activity": activity,
+                        "target": target,
+                        "batch": batch_i,
+                        "batch_size": len(docs),
+                        "duration_ms": int((time.time() - t0) * 1000),
+                    },
+                )
+                batch_i += 1
+
+        return final
+
     def _scrape_activity(
         self,
         activity: str,
@@ -349,12 +785,11 @@ class C2CScraper:
         scraped_ids = scraped_ids or set()
 
         if target == "routes":
-            api_url = f"{self.scraping_params['routes_url']}?{self.scraping_params['activities_filter']}{activity}"
-            worker_func = partial(
-                self.scrape_route,
-                routes_url=self.scraping_params["routes_url"],
-                outings_url=self.scraping_params["outings_url"],
-                routes_filter=self.scraping_params["routes_filter"],
+            api_url = f"{self.routes_url}?{self.activities_filter}{activity}"
+            worker_kwargs = dict(
+                routes_url=self.routes_url,
+                outings_url=self.outings_url,
+                routes_filter=self.routes_filter,
                 already_scraped_ids=scraped_ids,
                 update_date=self.update_date,
                 force_api_call=False,
@@ -364,14 +799,13 @@ class C2CScraper:
                 raise ValueError("When scraping outings first, update_date_start must be provided")
 
             api_url = (
-                f"{self.scraping_params['outings_url']}?"
-                f"{self.scraping_params['outings_date_filter']}"
+                f"{self.outings_url}?"
+                f"{self.outings_date_filter}"
                 f"{self.update_date_start.strftime('%Y-%m-%d')},{datetime.datetime.now().strftime('%Y-%m-%d')}"
-                f"&{self.scraping_params['activities_filter']}{activity}"
+                f"&{self.activities_filter}{activity}"
             )
-            worker_func = partial(
-                self.scrape_outing,
-                outings_url=self.scraping_params["outings_url"],
+            worker_kwargs = dict(
+                outings_url=self.outings_url,
                 already_scraped_ids=scraped_ids,
                 update_date=self.update_date,
                 force_api_call=True,
@@ -389,54 +823,9 @@ class C2CScraper:
             results_per_page=self.scraping_params.get("num_results_per_page", 100),
         )
 
-        final: List[dict] = []
-        for batch_i, payload in enumerate(callIterator):
-            docs = payload.get("documents", []) or []
-            t0 = time.time()
-
-            logger.info(
-                "c2c.batch.start",
-                extra={"activity": activity, "target": target, "batch": batch_i, "batch_size": len(docs)},
-            )
-
-            if self.parallel and len(docs) > 0:
-                with multiprocessing.Pool(self.num_processes) as pool:
-                    results = pool.map(worker_func, docs)
-            else:
-                results = [worker_func(doc) for doc in docs]
-
-            # Debug hard-stop
-            if self.debug_mode and batch_i > 1:
-                logger.warning("c2c.debug_stop", extra={"activity": activity, "target": target, "batch": batch_i})
-                final.extend(results)
-                break
-
-            # Summarize errors (don’t spam stack traces)
-            errors = [r for r in results if r.get("error")]
-            if errors:
-                logger.warning(
-                    "c2c.batch.errors",
-                    extra={
-                        "activity": activity,
-                        "target": target,
-                        "batch": batch_i,
-                        "error_count": len(errors),
-                        "sample_error": errors[0].get("error"),
-                    },
-                )
-
-            final.extend(results)
-
-            logger.info(
-                "c2c.batch.done",
-                extra={
-                    "activity": activity,
-                    "target": target,
-                    "batch": batch_i,
-                    "batch_size": len(docs),
-                    "duration_ms": int((time.time() - t0) * 1000),
-                },
-            )
+        final = asyncio.run(
+            self._scrape_batches_async(callIterator, target=target, worker_kwargs=worker_kwargs, activity=activity)
+        )
 
         logger.info(
             "c2c.api.done",
@@ -444,67 +833,30 @@ class C2CScraper:
         )
         return final
 
-    def _insert_item(self, session: Session, itemdata: Dict) -> None:
-        if itemdata.get("route_id"):
-            insert_route(session, **itemdata["routeInfo"])
-            return
-
-        if itemdata.get("outing_id"):
-            outing_id = itemdata["outing_id"]
-
-            # If scrape returned an error, skip insert (and log once)
-            if itemdata.get("error"):
-                logger.error("c2c.item.error", extra={"target": "outing", "outing_id": outing_id, "error": itemdata["error"]})
-                return
-
-            outing_not_written = True
-            for route in itemdata["outingInfo"]["routes"]:
-                route_id = route["route_id"]
-                engine = session.get_bind()
-                exists = check_route_existence(engine=engine, route_id=route_id)
-                if not exists:
-                    logger.info(
-                        "c2c.route.missing_for_outing",
-                        extra={"route_id": route_id, "outing_id": outing_id},
-                    )
-                    routeData = self.scrape_route(
-                        routeData=None,
-                        route_id=route_id,
-                        routes_url=self.scraping_params["routes_url"],
-                        outings_url=self.scraping_params["outings_url"],
-                        routes_filter=self.scraping_params["routes_filter"],
-                        already_scraped_ids=None,
-                        update_date=self.update_date,
-                    )
-                    if routeData.get("error"):
-                        logger.error(
-                            "c2c.item.error",
-                            extra={"target": "route", "route_id": route_id, "error": routeData["error"], "outing_id": outing_id},
-                        )
-                        continue
-                    insert_route(session, **routeData["routeInfo"])
-                    outing_not_written = False
-
-            if outing_not_written:
-                insert_outing(session, **itemdata["outingInfo"])
-
     def _scrape(self, engine: Engine, target: Literal["outings", "routes"]) -> Dict[str, dict]:
         if target not in {"outings", "routes"}:
             raise ValueError("target must be either 'outings' or 'routes'")
 
         message: Dict[str, dict] = {}
+
+        # One id load for the whole run: the set is kept up to date in memory
+        # after each activity's write phase instead of re-querying per activity
+        # (routes commonly span several activities).
+        if target == "routes":
+            scraped_ids_acc = set(load_scraped_routes_ids(engine=engine, min_date=datetime.datetime(2000, 1, 1)))
+        else:
+            scraped_ids_acc = set(load_scraped_outings_ids(
+                engine=engine,
+                min_date=self.update_date_start - datetime.timedelta(days=30),
+                mode="outing_date",
+            ))
+
         for act in self.scraping_params.get("activities_of_interest", []):
             t0 = time.time()
             logger.info("c2c.activity.start", extra={"activity": act, "target": target})
 
-            if target == "routes":
-                scraped_ids = load_scraped_routes_ids(engine=engine, min_date=datetime.datetime(2000, 1, 1))
-            else:
-                scraped_ids = load_scraped_outings_ids(
-                    engine=engine,
-                    min_date=self.update_date_start - datetime.timedelta(days=30),
-                    mode="outing_date",
-                )
+            # frozen: shared read-only by every async worker of the batch
+            scraped_ids = frozenset(scraped_ids_acc)
 
             logger.info(
                 "c2c.db.loaded_ids",
@@ -513,32 +865,81 @@ class C2CScraper:
 
             results = self._scrape_activity(activity=act, target=target, scraped_ids=scraped_ids)
 
-            with Session(engine) as session:
-                skipped = 0
-                written = 0
-                errored = 0
-
-                for item in tqdm(results, desc=f"Writing {act}", disable=disable_tqdm):
-                    if item.get("skipped"):
-                        skipped += 1
-                        continue
-                    if item.get("error"):
-                        errored += 1
-                        continue
-
-                    try:
-                        self._insert_item(session, item)
-                        written += 1
-                    except IntegrityError:
-                        session.rollback()
-                        logger.warning(
-                            "c2c.db.integrity_error",
-                            extra={
-                                "target": target,
-                                "route_id": item.get("route_id"),
-                                "outing_id": item.get("outing_id"),
-                            },
+            skipped = sum(1 for item in results if item.get("skipped"))
+            errored = sum(1 for item in results if not item.get("skipped") and item.get("error"))
+            valid = [item for item in results if not item.get("skipped") and not item.get("error")]
+
+            # Core bulk ingestion: a handful of executemany statements per table
+            # (ON CONFLICT DO NOTHING) instead of one ORM flush per item.
+            if target == "routes":
+                # dedupe on route_id in case a page shift returned the same doc twice
+                route_payloads = list(
+                    {item["routeInfo"]["route_id"]: item["routeInfo"] for item in valid if item.get("routeInfo")}.values()
+                )
+                outing_payloads: List[dict] = []
+            else:
+                # one IN query for every route referenced by this batch of outings,
+                # instead of one existence check per outing-route pair
+                referenced_route_ids = {
+                    route["route_id"]
+                    for item in valid
+                    if item.get("outingInfo")
+                    for route in item["outingInfo"].get("routes", [])
+                }
+                existing_route_ids = check_routes_exist(engine, referenced_route_ids)
+
+                route_payloads = []
+                outing_payloads = []
+                for item in tqdm(valid, desc=f"Resolving {act}", disable=disable_tqdm):
+                    outing_id = item["outing_id"]
+                    for route in item["outingInfo"].get("routes", []):
+                        route_id = route["route_id"]
+                        if route_id in existing_route_ids:
+                            continue
+                        logger.info(
+                            "c2c.route.missing_for_outing",
+                            extra={"route_id": route_id, "outing_id": outing_id},
                         )
+                        routeData = self.scrape_route(
+                            routeData=None,
+                            route_id=route_id,
+                            routes_url=self.routes_url,
+                            outings_url=self.outings_url,
+                            routes_filter=self.routes_filter,
+                            already_scraped_ids=None,
+                            update_date=self.update_date,
+                            # the route's outing history can be hundreds of pages;
+                            # the update loop covers outings, so skip it here
+                            fetch_outings=False,
+                        )
+                        if routeData.get("error"):
+                            logger.error(
+                                "c2c.item.error",
+                                extra={"target": "route", "route_id": route_id, "error": routeData["error"], "outing_id": outing_id},
+                            )
+                            continue
+                        route_payloads.append(routeData["routeInfo"])
+                        existing_route_ids.add(route_id)
+                    # the recovered route carries no outings now, so the outing
+                    # row itself is always written
+                    outing_payloads.append(item["outingInfo"])
+
+            with Session(engine) as session:
+                insert_routes_bulk(session, route_payloads)
+                insert_outings_bulk(session, outing_payloads)
+
+            written = len(route_payloads) + len(outing_payloads)
+
+            # keep the in-memory id set in sync with what this activity wrote
+            if target == "routes":
+                scraped_ids_acc.update(payload["route_id"] for payload in route_payloads)
+            else:
+                scraped_ids_acc.update(payload["outing_id"] for payload in outing_payloads)
+                scraped_ids_acc.update(
+                    outing["outing_id"]
+                    for payload in route_payloads
+                    for outing in payload.get("outings", [])
+                )
 
             message[act] = {
                 "total_scraped": len(results),
@@ -560,7 +961,8 @@ class C2CScraper:
         return message
 
     def run(self) -> Dict[str, dict]:
-        engine = create_engine(self.dbstring)
+        # get_engine applies the SQLite WAL/synchronous PRAGMAs and pool settings
+        engine = get_engine(self.dbstring)
 
         logger.info("c2c.run.start", extra={"mode": self.mode})
 
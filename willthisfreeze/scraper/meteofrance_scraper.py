@@ -1,25 +1,48 @@
 import sys
+import asyncio
 import logging
+import aiohttp
+import orjson
 import requests
 from typing import Literal, Optional, Set, Dict, List
 import datetime as dt
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
+import shutil
 import sys
 import requests
 import pandas as pd
 from typing import Tuple, List
 from tqdm import tqdm
 from sqlalchemy.orm import Session
-from sqlalchemy import create_engine, Engine
+from sqlalchemy import Engine
 
 
-from willthisfreeze.dbutils.dbutils import load_scraped_stations_ids, insert_weather_station
+from willthisfreeze.dbutils.dbutils import get_engine, load_scraped_stations_ids, insert_weather_stations_bulk
+from willthisfreeze.scraper.utils import make_http_session, retry_after_seconds
 
 
 disable_tqdm = not sys.stdout.isatty()
 logger = logging.getLogger(__name__)
 
+# stations excluded from scraping (known-bad metadata)
+_STATION_BLACKLIST = frozenset({"73187403"})
+
+
+def _find_first_digit_string(obj) -> Optional[str]:
+    """Iterative walk over a decoded JSON payload for the first all-digit value."""
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, dict):
+            stack.extend(cur.values())
+        elif isinstance(cur, list):
+            stack.extend(cur)
+        elif isinstance(cur, (str, int)) and str(cur).isdigit():
+            return str(cur)
+    return None
+
 
 
 class MFScraper():
@@ -47,6 +70,19 @@ class MFScraper():
             "apikey": f"{self.API_KEY}"
         }
 
+        # One pooled session for all API calls: keep-alive avoids a TCP+TLS handshake per request
+        self.session = make_http_session()
+
+        # per-department fetch concurrency, departments scraped in parallel,
+        # and the aggregate request budget shared across all of them
+        self.METADATA_CONCURRENCY = 8
+        self.DEPARTMENT_WORKERS = 6
+        self.METADATA_RATE_PER_S = 8
+        # every in-flight slot (DEPARTMENT_WORKERS * METADATA_CONCURRENCY of
+        # them) pauses this long per request, so together they stay near the
+        # METADATA_RATE_PER_S budget instead of multiplying it
+        self._metadata_pacing_s = (self.DEPARTMENT_WORKERS * self.METADATA_CONCURRENCY) / self.METADATA_RATE_PER_S
+
         self.INFORMATION_STATION = "/information-station"
         self.COMMANDE_STATION_HORAIRE = "/commande-station/horaire"
         self.COMMANDE_STATION_QUOTIDIENNE = "/commande-station/quotidienne"
@@ -58,7 +94,11 @@ class MFScraper():
       
     @staticmethod
     def _iso(dt_obj: dt.datetime) -> str:
-        return dt_obj.strftime("%Y-%m-%dT%H:%M:%SZ")
+        # direct interpolation skips strftime's format-string parsing
+        return (
+            f"{dt_obj.year:04d}-{dt_obj.month:02d}-{dt_obj.day:02d}"
+            f"T{dt_obj.hour:02d}:{dt_obj.minute:02d}:{dt_obj.second:02d}Z"
+        )
     
     @staticmethod
     def chunk_period(start: dt.date, end: dt.date, max_days: int = 366) -> List[Tuple[dt.date, dt.date]]:
@@ -72,36 +112,48 @@ class MFScraper():
         return chunks
     
     @staticmethod
-    def combine_csvs(file_list: List[str], out_csv: str) -> pd.DataFrame:
-        dfs = []
-        for f in file_list:
-            try:
-                df = pd.read_csv(f, sep=';')
-                dfs.append(df)
-            except Exception as e:
-                #logger.warning(f"Warning: failed to read {f}: {e}")
-                pass
-        if not dfs:
+    def combine_csvs(file_list: List[str], out_csv: str, return_df: bool = False) -> Optional[pd.DataFrame]:
+        """
+        Concatenate per-chunk CSVs by byte append: every chunk comes from the
+        same endpoint with the same header, so the first readable file is
+        copied wholesale and only the body of the following ones is appended.
+        No per-file parsing and no list of DataFrames held in RAM; pass
+        return_df=True to parse the combined file once at the end.
+        """
+        wrote_any = False
+        with open(out_csv, "wb") as out:
+            for f in file_list:
+                try:
+                    if os.path.getsize(f) == 0:
+                        continue
+                    with open(f, "rb") as fh:
+                        if wrote_any:
+                            fh.readline()  # skip the duplicated header
+                        shutil.copyfileobj(fh, out)
+                    wrote_any = True
+                except OSError:
+                    #logger.warning(f"Warning: failed to read {f}: {e}")
+                    continue
+        if not return_df:
+            return None
+        if not wrote_any:
             return pd.DataFrame()
-        big = pd.concat(dfs, ignore_index=True, sort=False)
-        big.to_csv(out_csv, index=False)
-        return big
+        return pd.read_csv(out_csv, sep=';')
 
-    @staticmethod
-    def get_with_retry(url, max_retry=5, sleep=10,**kwargs):
-        resp = requests.get(url=url, **kwargs)
+    def get_with_retry(self, url, max_retry=5, sleep=10,**kwargs):
+        resp = self.session.get(url=url, **kwargs)
         for i in range(max_retry):
             status_code = resp.status_code
             if status_code in [200, 201, 202]:
                 return resp
-            elif status_code==429: #rate limit reached
-                #logger.info("Rate limit reached, pausing for 1 min...")
-                time.sleep(60)
-                resp = requests.get(url=url, **kwargs)
+            elif status_code==429: #rate limit reached, honor Retry-After if provided
+                #logger.info("Rate limit reached, pausing...")
+                time.sleep(retry_after_seconds(resp.headers, fallback=60))
+                resp = self.session.get(url=url, **kwargs)
             elif status_code in [500, 502, 503, 504]:
                 #logger.info("Request returned error code %i, sleeping for %i seconds...", status_code, sleep)
                 time.sleep(10)
-                resp = requests.get(url=url, **kwargs)
+                resp = self.session.get(url=url, **kwargs)
             else:
                 break
         return resp
@@ -116,7 +168,45 @@ class MFScraper():
         r = self.get_with_retry(url=self._url(self.INFORMATION_STATION), headers=self.HEADERS, params=params, timeout=60)
         #r = requests.get(self._url(self.INFORMATION_STATION), headers=self.HEADERS, params=params, timeout=60)
         r.raise_for_status()
-        return r.json()[0]
+        return orjson.loads(r.content)[0]
+
+    async def _get_station_metadata_async(self, http: aiohttp.ClientSession, sem: asyncio.Semaphore, station_id: str) -> dict:
+        """Async counterpart of get_station_metadata, sharing one aiohttp session.
+
+        Retries mirror get_with_retry: honor Retry-After on 429, back off on 5xx.
+        """
+        url = self._url(self.INFORMATION_STATION)
+        params = {"id-station": station_id}
+        async with sem:
+            for _ in range(5):
+                async with http.get(url, params=params, timeout=aiohttp.ClientTimeout(total=60)) as resp:
+                    if resp.status in (200, 201, 202):
+                        payload = orjson.loads(await resp.read())
+                        # shared pacing across all department workers
+                        await asyncio.sleep(self._metadata_pacing_s)
+                        return payload[0]
+                    if resp.status == 429:
+                        delay = retry_after_seconds(resp.headers, fallback=60)
+                    elif resp.status in (500, 502, 503, 504):
+                        delay = 10
+                    else:
+                        # non-retryable: surface 4xx/5xx, and don't loop on odd
+                        # success codes (204, 304) that carry no payload
+                        resp.raise_for_status()
+                        raise RuntimeError(
+                            f"Unexpected status {resp.status} for station metadata {station_id}"
+                        )
+                await asyncio.sleep(delay)
+            raise RuntimeError(f"Giving up on station metadata for {station_id} after retries")
+
+    async def _get_stations_metadata_async(self, station_ids: List[str]) -> Dict[str, dict]:
+        """Fetch metadata for all given stations concurrently, keyed by station id."""
+        sem = asyncio.Semaphore(self.METADATA_CONCURRENCY)
+        async with aiohttp.ClientSession(headers=self.HEADERS) as http:
+            results = await asyncio.gather(
+                *(self._get_station_metadata_async(http, sem, sid) for sid in station_ids)
+            )
+        return dict(zip(station_ids, results))
 
     def scrape_stations_metadata(self, cadence: str, department: int, already_scraped_ids: Set) -> List[Dict]:
         """
@@ -141,41 +231,47 @@ class MFScraper():
         r = self.get_with_retry(url=self._url(endpoint), headers={**self.HEADERS, "Content-Type": "application/json"}, params=params, timeout=60)
         #r = requests.get(url=self._url(endpoint), headers={**self.HEADERS, "Content-Type": "application/json"}, params=params, timeout=60)
         r.raise_for_status()
-        j = r.json()
+        j = orjson.loads(r.content)
 
         stationsList = []
+        to_fetch = []
         #logger.info("Scraping %i stations for department %i", len(j), department)
-        for s in tqdm(j, disable=disable_tqdm):
+        for s in j:
             station_id = s.get('id')
-            if (station_id in already_scraped_ids) or not(s.get('posteOuvert')) or (int(station_id)==73187403):
+            if (station_id in already_scraped_ids) or not(s.get('posteOuvert')) or (station_id in _STATION_BLACKLIST):
                 stationsList.append({"station_id": station_id, "skipped": True, "stationInfo": {}})
             else:
-                station_details = self.get_station_metadata(station_id=station_id)
-
-                date_start = station_details.get('dateDebut', '1900-01-01 00:00:00')
-                date_end = station_details.get('dateFin') or ''
-                paramslist = [{'parameter_name': p.get('nom'), 'last_updated': self.update_date} for p in station_details.get('parametres', [])]
-
-                station_info = {
-                    'station_id': station_id,
-                    'name': s.get('nom'),
-                    'lon': float(s.get('lon')),
-                    'lat': float(s.get('lat')),
-                    'altitude': int(s.get('alt')),
-                    'date_start': dt.datetime.strptime(date_start, "%Y-%m-%d %H:%M:%S"),
-                    'date_end': dt.datetime.strptime('2100-01-01 00:00:00' if date_end=='' else date_end, "%Y-%m-%d %H:%M:%S"),
-                    'last_updated': self.update_date,
-                    'station_parameters': paramslist
-                }
-                stationsList.append(
-                    {"station_id": station_id, 
-                     "skipped": False, 
-                     "stationInfo": station_info}
-                )
+                to_fetch.append(s)
+
+        # metadata calls are pure I/O: fetch them all concurrently instead of
+        # one request + one second of sleep per station
+        details_by_id = asyncio.run(self._get_stations_metadata_async([s.get('id') for s in to_fetch]))
+
+        for s in tqdm(to_fetch, disable=disable_tqdm):
+            station_id = s.get('id')
+            station_details = details_by_id[station_id]
+
+            date_start = station_details.get('dateDebut', '1900-01-01 00:00:00')
+            date_end = station_details.get('dateFin') or ''
+            paramslist = [{'parameter_name': p.get('nom'), 'last_updated': self.update_date} for p in station_details.get('parametres', [])]
+
+            station_info = {
+                'station_id': station_id,
+                'name': s.get('nom'),
+                'lon': float(s.get('lon')),
+                'lat': float(s.get('lat')),
+                'altitude': int(s.get('alt')),
+                'date_start': dt.datetime.fromisoformat(date_start),
+                'date_end': dt.datetime.fromisoformat('2100-01-01 00:00:00' if date_end=='' else date_end),
+                'last_updated': self.update_date,
+                'station_parameters': paramslist
+            }
+            stationsList.append(
+                {"station_id": station_id, 
+                 "skipped": False, 
+                 "stationInfo": station_info}
+            )
 
-                # small sleep to be polite to API (respect rate limits)
-                time.sleep(1)
-        
         return stationsList
 
     def place_command(self, cadence: str, station_id: str, start_dt: dt.datetime, end_dt: dt.datetime) -> str:
@@ -200,30 +296,19 @@ class MFScraper():
         }
         # The real API might require a different JSON structure or param names:
         # consult the API doc. Here we post JSON and expect an identifier in the JSON response.
-        r = requests.get(self._url(endpoint), headers={**self.HEADERS, "Content-Type": "application/json"}, params=params, timeout=60)
+        r = self.session.get(self._url(endpoint), headers={**self.HEADERS, "Content-Type": "application/json"}, params=params, timeout=60)
         r.raise_for_status()
-        j = r.json()
+        j = orjson.loads(r.content)
         # docs indicate response includes something like:
         # {"elaboreProduitAvecDemandeResponse":{"return":"768920711487"}}
-        # try to extract robustly:
+        # try the documented location first, then walk for a plausible id:
         order_id = None
         if isinstance(j, dict):
-            # walk for a plausible id:
-            def find_id(obj):
-                if isinstance(obj, dict):
-                    for k, v in obj.items():
-                        if isinstance(v, (str, int)) and str(v).isdigit():
-                            return str(v)
-                        found = find_id(v)
-                        if found:
-                            return found
-                if isinstance(obj, list):
-                    for item in obj:
-                        found = find_id(item)
-                        if found:
-                            return found
-                return None
-            order_id = find_id(j)
+            documented = j.get("elaboreProduitAvecDemandeResponse", {}).get("return")
+            if isinstance(documented, (str, int)) and str(documented).isdigit():
+                order_id = str(documented)
+            else:
+                order_id = _find_first_digit_string(j)
         if not order_id:
             raise RuntimeError("Could not extract order id from response: " + str(j))
         return order_id
@@ -233,21 +318,26 @@ class MFScraper():
         Poll the commande/fichier service until the file is ready, then download it.
         Returns the path to the downloaded file.
         """
-        deadline = time.time() + timeout_minutes * 60
+        deadline = time.monotonic() + timeout_minutes * 60
         status_url = self._url(self.COMMANDE_FICHIER)
         params = {"id-cmde": order_id}
+        fname = os.path.join(out_dir, f"mf_cmd_{order_id}.csv")
         while True:
-            r = requests.get(status_url, headers=self.HEADERS, params=params, timeout=60)
+            r = self.session.get(status_url, headers=self.HEADERS, params=params, timeout=60, stream=True)
             r.raise_for_status()
-            fname = os.path.join(out_dir, f"mf_cmd_{order_id}.csv")
-            with open(fname, "wb") as fh:
-                fh.write(r.content)
+            # 204 means the file is still being produced; anything that is not
+            # CSV (e.g. a JSON status blob) must not land on disk as a .csv,
+            # it would poison combine_csvs downstream
+            content_type = r.headers.get("Content-Type", "")
+            if r.status_code != 204 and content_type.startswith(("text/csv", "application/octet-stream")):
+                # stream to disk rather than buffering the whole file in RAM
+                with open(fname, "wb") as fh:
+                    for chunk in r.iter_content(chunk_size=64 * 1024):
+                        fh.write(chunk)
                 return fname
+            r.close()
 
-            # If the API directly returns file content (sometimes), check headers:
-            # If content-type seems like CSV and content is not JSON:
-            # We'll call status endpoint without Accept header to see content directly:
-            if time.time() > deadline:
+            if time.monotonic() > deadline:
                 raise TimeoutError(f"Timed out waiting for order {order_id} after {timeout_minutes} minutes.")
             time.sleep(wait_seconds)
 
@@ -296,8 +386,8 @@ class MFScraper():
 
         # 3) Combine results
         out_csv = os.path.join(out_dir, f"station_{station}_{start}_to_{end}.csv")
-        df = self.combine_csvs(downloaded_files, out_csv)
-        #logger.info(f"Combined data saved to {out_csv}. Rows: {len(df)}")
+        self.combine_csvs(downloaded_files, out_csv)
+        #logger.info(f"Combined data saved to {out_csv}")
 
     def _load_stations_metadata(self,
                                 engine: Engine,
@@ -314,29 +404,36 @@ class MFScraper():
 
         scraped_dpt, skipped_dpt = 0, 0
         written, skipped = 0,0
+        to_scrape = [dept for dept in range(1,96) if dept not in already_scraped_department]
+        skipped_dpt = 95 - len(to_scrape)
+        # FOR DEBUGGING ONLY
+        #to_scrape = to_scrape[:3]
+
         #logger.info("Scraping weather stations metadata...")
-        for dept in range(1,96):
-            if dept in already_scraped_department:
-                #logger.info("Skipping department %i", dept)
-                skipped_dpt += 1 
-            else:
-                stations = self.scrape_stations_metadata(cadence=cadence, department=dept, already_scraped_ids=already_scraped_stations)
+        # departments are independent and I/O-bound, so fan them out; the
+        # insert+commit stays in this thread so each department is still
+        # written atomically, which the restart logic above relies on
+        with ThreadPoolExecutor(max_workers=self.DEPARTMENT_WORKERS) as executor:
+            futures = {
+                executor.submit(
+                    self.scrape_stations_metadata,
+                    cadence=cadence,
+                    department=dept,
+                    already_scraped_ids=already_scraped_stations,
+                ): dept
+                for dept in to_scrape
+            }
+            for future in as_completed(futures):
+                stations = future.result()
                 scraped_dpt += 1
+                to_insert = [stationInfo["stationInfo"] for stationInfo in stations if not stationInfo["skipped"]]
+                skipped += len(stations) - len(to_insert)
+                written += len(to_insert)
                 #logger.info("Writing weather stations metadata in DB...")
+                # Batch writing of weather stations ensuring that all the stations from a given department are written together. 
+                # This is important for the restart logic, which considers that if stations from a given department are already in db, the whole department stations have been scraped and it can be skipped
                 with Session(engine) as session:
-                    for stationInfo in stations:
-                        if stationInfo["skipped"]:
-                            #logging.info("Skipping station with id %s", stationInfo["station_id"])
-                            skipped+=1
-                        else:
-                            insert_weather_station(session=session, commit=False, **stationInfo["stationInfo"])
-                            written += 1
-                    # Batch writing of weather stations ensuring that all the stations from a given department are written together. 
-                    # This is important for the restart logic, which considers that if stations from a given department are already in db, the whole department stations have been scraped and it can be skipped
-                    session.commit()
-            # FOR DEBUGGING ONLY
-            #if dept>=3:
-            #    break
+                    insert_weather_stations_bulk(session, to_insert)
         
         #logger.info("Written %i stations for %i departments, skipped %i stations and %i departments", written, scraped_dpt, skipped, skipped_dpt)
 
@@ -345,7 +442,7 @@ class MFScraper():
     
     def run(self) -> None:
         """Entry point for scraper."""
-        engine = create_engine(self.DBSTRING)   
+        engine = get_engine(self.DBSTRING)
         if self.mode == "update":
             pass
         elif self.mode == "init":
@@ -1,10 +1,98 @@
+import functools
 import json
 import math
+import os
 import requests
-from typing import List
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Optional
+import numpy as np
 from pyproj import Transformer
 
-import importlib_resources
+
+#--------------------------
+# HTTP session pooling
+#--------------------------
+
+# Endpoints whose responses are (near-)immutable and safe to serve from disk;
+# everything else bypasses the cache so update detection keeps working.
+_CACHE_URLS_EXPIRE_AFTER = {
+    "*camptocamp.org/routes/*": 86400,              # route details: 1 day
+    "*/DPClim/v1/liste-stations*": 86400 * 30,      # station lists: 30 days
+    "*/DPClim/v1/information-station*": 86400 * 30, # station metadata: 30 days
+}
+
+
+def _base_session() -> requests.Session:
+    """Plain or disk-cached session, depending on availability and env toggle."""
+    if os.getenv("SCRAPER_CACHE_DISABLE") == "1":
+        return requests.Session()
+    try:
+        from requests_cache import DO_NOT_CACHE, CachedSession
+    except ImportError:
+        return requests.Session()
+
+    return CachedSession(
+        os.getenv("SCRAPER_CACHE_PATH", "data/scraper_cache.sqlite"),
+        backend="sqlite",
+        cache_control=True,
+        expire_after=DO_NOT_CACHE,
+        urls_expire_after=_CACHE_URLS_EXPIRE_AFTER,
+    )
+
+
+def make_http_session(pool_connections: int = 50,
+                      pool_maxsize: int = 100,
+                      max_retries: int = 5,
+                      backoff_factor: float = 0.5) -> requests.Session:
+    """
+    Build a requests.Session with a tuned connection pool and retry policy.
+    Reusing one session keeps TCP+TLS connections alive across calls instead
+    of paying a full handshake per request. Responses from immutable
+    endpoints are cached on disk (set SCRAPER_CACHE_DISABLE=1 to opt out).
+    """
+    session = _base_session()
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = "willthisfreeze-scraper"
+    return session
+
+
+def retry_after_seconds(headers, fallback: float) -> float:
+    """
+    Parse a Retry-After header (delay-seconds form) from a response headers
+    mapping, falling back to the given delay when absent or unparseable.
+    """
+    value = headers.get("Retry-After")
+    if value is None:
+        return fallback
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return fallback
+
+
+_http_session: Optional[requests.Session] = None
+
+def get_http_session() -> requests.Session:
+    """Process-wide shared session for the sync scraping paths."""
+    global _http_session
+    if _http_session is None:
+        _http_session = make_http_session()
+    return _http_session
+
+
+@functools.lru_cache(maxsize=32)
+def _get_transformer(source_epsg: int) -> Transformer:
+    """Compiled PROJ pipelines are expensive to build; cache one per EPSG code."""
+    return Transformer.from_crs(f"EPSG:{source_epsg}", "EPSG:4326", always_xy=True)
 
 
 def to_latlon(x, y, source_epsg=3857):
@@ -18,10 +106,25 @@ def to_latlon(x, y, source_epsg=3857):
     Returns:
         (latitude, longitude) in decimal degrees
     """
-    transformer = Transformer.from_crs(f"EPSG:{source_epsg}", "EPSG:4326", always_xy=True)
-    lon, lat = transformer.transform(x, y)
+    lon, lat = _get_transformer(source_epsg).transform(x, y)
     return lat, lon
 
+
+def to_latlon_batch(xs, ys, source_epsg=3857):
+    """
+    Vectorized counterpart of to_latlon: converts arrays of projected
+    coordinates in a single PROJ call.
+
+    Parameters:
+        xs, ys: array-likes of coordinates in meters
+        source_epsg: EPSG code of the input projection
+
+    Returns:
+        (lats, lons) ndarrays in decimal degrees
+    """
+    lons, lats = _get_transformer(source_epsg).transform(np.asarray(xs), np.asarray(ys))
+    return lats, lons
+
 def filter_area(area: dict) -> bool:
     if area.get('area_type', '')=='country':
         return True
@@ -50,17 +153,21 @@ def get_geo_coordinates(routeData: dict) -> tuple:
 
     return lon, lat
 
+def _first_french(locales: List[dict]) -> Optional[dict]:
+    """First locale entry in french, without materializing the filtered list."""
+    return next((loc for loc in locales if loc.get('lang', '') == 'fr'), None)
+
+
 def get_countries_list(route: dict) -> List:
     
     areas = route.get("areas", {}) or {}
-    admin = filter(filter_area,  areas)
 
     countries = []
-    for adm in list(admin):
-        lang = list(filter(filter_langs, adm.get('locales', [])))
-        name = None
-        if len(lang)>0:
-            name = lang[0].get('title', None) 
+    for adm in areas:
+        if not filter_area(adm):
+            continue
+        lang = _first_french(adm.get('locales', []))
+        name = lang.get('title', None) if lang else None
         countries.append({"country_id":adm['document_id'], "countryName":name})
     
     return countries
@@ -68,38 +175,23 @@ def get_countries_list(route: dict) -> List:
 
 def get_title(route: dict) -> str:
     
-    locales = route.get("locales", {}) or {}
-    locales = list(filter(filter_langs,  locales)) # filter_langs does the right job in this case: keep only the french version
+    locale = _first_french(route.get("locales", {}) or {}) # keep only the french version
 
     waypoint = route.get("associations", {}).get("waypoints", [{}])[0].get("locales", [])  #first waypoint should be the main (not always true?)
-    waypoint = list(filter(filter_langs,  waypoint))
+    waypoint = _first_french(waypoint)
     
-    if (len(waypoint)==0) & (len(locales)==0):
+    if waypoint is None and locale is None:
         return ''
 
-    if len(locales)==0:
-        return waypoint[0].get("title", "")
+    if locale is None:
+        return waypoint.get("title", "")
     
-    if len(waypoint)==0:
-        return locales[0].get("title", "")
+    if waypoint is None:
+        return locale.get("title", "")
     
-    return ', '.join([waypoint[0].get("title", ""), locales[0].get("title", "")])
+    return ', '.join([waypoint.get("title", ""), locale.get("title", "")])
 
 
-def read_config() -> dict:
-    
-    my_resources = importlib_resources.files("willthisfreeze")
-    data = json.loads(my_resources.joinpath("scraper", "config.json").read_bytes())
-
-    return data
-
-def read_secret() -> dict:
-    
-    my_resources = importlib_resources.files("willthisfreeze")
-    data = json.loads(my_resources.joinpath("scraper", "secret.json").read_bytes())
-
-    return data
-
 
 #--------------------------
 # Utilities for weather stations attribution
@@ -109,9 +201,10 @@ def bounding_box(coord, max_distance_km):
     """
     Calculate a bounding box around a coordinate such that all points
     within the box are within `max_distance_km` from the coordinate.
+    Accepts scalars or NumPy arrays for the coordinate components.
 
     Parameters:
-        coord: tuple (lat, lon) in decimal degrees
+        coord: tuple (lat, lon) in decimal degrees (each scalar or ndarray)
         max_distance_km: maximum distance in kilometers
 
     Returns:
@@ -126,17 +219,44 @@ def bounding_box(coord, max_distance_km):
     max_lat = lat + delta_lat
 
     # Longitude bounds depend on latitude
-    delta_lon = (max_distance_km / R) * (180 / math.pi) / math.cos(math.radians(lat))
+    delta_lon = delta_lat / np.cos(np.deg2rad(lat))
     min_lon = lon - delta_lon
     max_lon = lon + delta_lon
 
     return (min_lat, max_lat, min_lon, max_lon)
 
+def haversine_vec(lat1, lon1, lats2, lons2):
+    """
+    Great-circle distances between one point and N points, vectorized.
+    All the per-pair trig runs in one C-level NumPy pass instead of the
+    Python interpreter.
+
+    Parameters:
+        lat1, lon1: reference point in decimal degrees
+        lats2, lons2: ndarrays of latitudes/longitudes in decimal degrees
+
+    Returns:
+        ndarray of distances in kilometers
+    """
+    R = 6371.0
+
+    phi1 = np.deg2rad(lat1)
+    phi2 = np.deg2rad(lats2)
+    delta_phi = np.deg2rad(lats2 - lat1)
+    delta_lambda = np.deg2rad(lons2 - lon1)
+
+    a = np.sin(delta_phi / 2.0) ** 2 + \
+        np.cos(phi1) * np.cos(phi2) * np.sin(delta_lambda / 2.0) ** 2
+    c = 2 * np.arcsin(np.sqrt(a))
+
+    return R * c
+
 def haversine_distance(coord1, coord2):
     """
-    Calculate the great-circle distance between two points on Earth 
+    Calculate the great-circle distance between two points on Earth
     given as (latitude, longitude) pairs using the Haversine formula.
-    
+    Thin scalar wrapper around haversine_vec, kept for backward compat.
+
     Parameters:
         coord1: tuple of (lat1, lon1) in decimal degrees
         coord2: tuple of (lat2, lon2) in decimal degrees
@@ -144,22 +264,6 @@ def haversine_distance(coord1, coord2):
     Returns:
         Distance in kilometers (float)
     """
-    # Radius of Earth in kilometers
-    R = 6371.0
-
     lat1, lon1 = coord1
     lat2, lon2 = coord2
-
-    # Convert decimal degrees to radians
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    delta_phi = math.radians(lat2 - lat1)
-    delta_lambda = math.radians(lon2 - lon1)
-
-    # Haversine formula
-    a = math.sin(delta_phi / 2.0) ** 2 + \
-        math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2.0) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-    distance = R * c
-    return distance
+    return float(haversine_vec(lat1, lon1, np.asarray([lat2]), np.asarray([lon2]))[0])
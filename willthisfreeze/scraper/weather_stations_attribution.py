@@ -1,75 +1,108 @@
+import hashlib
 import logging
+import math
 import sys
 import os
 import time
-from typing import List, Literal
+from typing import List, Literal, Tuple
 
+import numpy as np
+from scipy.spatial import cKDTree
 from tqdm import tqdm
-from sqlalchemy import delete
+from sqlalchemy import bindparam, delete, exists, text, update
 from sqlalchemy.orm import Session
-from sqlalchemy.orm.query import Query
 
-from willthisfreeze.scraper.utils import bounding_box, haversine_distance
-from willthisfreeze.dbutils import read_config, get_engine, load_routes
+from willthisfreeze.dbutils import get_engine, load_route_coords, load_stations_np
 from willthisfreeze.dbutils.schema import Routes, WeatherStation, route_stations_mapping
 
 logger = logging.getLogger(__name__)
 disable_tqdm = not sys.stdout.isatty()
 
+EARTH_RADIUS_KM = 6371.0
+
 
 # -----------------------
 # Helpers
 # -----------------------
 def reset_attribution(session: Session) -> None:
+    """Wipe all route-station links; committed together with the first rebuilt batch."""
     logger.warning("ws_attr.reset_mapping")
-    session.execute(delete(route_stations_mapping))
-    session.commit()
+    if session.get_bind().dialect.name == "postgresql":
+        # TRUNCATE skips per-row WAL and leaves no dead tuples behind
+        session.execute(text("TRUNCATE TABLE route_stations_mapping"))
+    else:
+        session.execute(delete(route_stations_mapping))
 
 
-def check_routes_for_update(routes: Query) -> Query:
-    logger.info("ws_attr.find_routes_missing_stations")
-    return (
-        routes.outerjoin(Routes.stations)
-        .filter(WeatherStation.station_id.is_(None))
-    )
+def coord_hash(lat: float, lon: float) -> str:
+    """Content hash of a route's coordinates, stored at attribution time."""
+    return hashlib.md5(f"{lat!r},{lon!r}".encode()).hexdigest()
 
 
-def load_stations_within_radius(session: Session, lat: float, lon: float, radius_km: float):
-    """Return ORM WeatherStation objects within bounding box."""
-    min_lat, max_lat, min_lon, max_lon = bounding_box(coord=(lat, lon), max_distance_km=radius_km)
-    return (
-        session.query(WeatherStation)
-        .filter(
-            WeatherStation.lat.between(min_lat, max_lat),
-            WeatherStation.lon.between(min_lon, max_lon),
-        )
-        .all()
-    )
+def route_needs_attribution(lat: float, lon: float, attribution_coord_hash: str) -> bool:
+    """True for routes never attributed or whose coordinates changed since."""
+    return attribution_coord_hash != coord_hash(lat, lon)
+
+
+def _unit_sphere_xyz(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Project (lat, lon) in decimal degrees onto cartesian coordinates on the unit sphere."""
+    lats_rad = np.deg2rad(lats)
+    lons_rad = np.deg2rad(lons)
+    cos_lat = np.cos(lats_rad)
+    return np.column_stack([cos_lat * np.cos(lons_rad), cos_lat * np.sin(lons_rad), np.sin(lats_rad)])
+
+
+def build_stations_index(session: Session) -> Tuple[List[str], cKDTree]:
+    """
+    Load all weather stations once and build a KD-tree on their unit-sphere coordinates.
+    Replaces the per-route bounding-box SQL scan: stations are queried in-process afterwards.
+    """
+    station_ids, lats, lons = load_stations_np(session.get_bind())
+    if not station_ids:
+        return station_ids, None
+
+    tree = cKDTree(_unit_sphere_xyz(lats, lons))
 
+    logger.info("ws_attr.stations_index.built", extra={"stations_count": len(station_ids)})
+    return station_ids, tree
 
-def filter_stations(route: Routes, stations: List[WeatherStation], nkeep: int = 10) -> List[int]:
-    """Compute distance to route and return closest station IDs."""
-    if not stations:
-        return []
+
+def nearest_stations_batch(tree: cKDTree, station_ids: List[str], lats: np.ndarray, lons: np.ndarray,
+                           radius_km: float, nkeep: int = 10) -> List[List[str]]:
+    """
+    Resolve the nkeep closest stations within radius_km for a whole batch of points
+    in one multi-threaded KD-tree query (workers=-1 uses all cores).
+    """
+    points = _unit_sphere_xyz(lats, lons)
+    # great-circle radius -> chord length on the unit sphere
+    chord = 2.0 * math.sin(radius_km / (2.0 * EARTH_RADIUS_KM))
+    dists, idx = tree.query(points, k=min(nkeep, len(station_ids)), distance_upper_bound=chord, workers=-1)
+    dists = dists.reshape(len(points), -1)
+    idx = idx.reshape(len(points), -1)
     return [
-        station.station_id
-        for station in sorted(
-            stations,
-            key=lambda s: haversine_distance((route.lat, route.lon), (s.lat, s.lon)),
-        )[:nkeep]
+        [station_ids[i] for d, i in zip(dist_row, idx_row) if np.isfinite(d)]
+        for dist_row, idx_row in zip(dists, idx)
     ]
 
 
-def update_routes_station_mapping(session: Session, route: Routes, station_ids: List[int]) -> None:
-    if not station_ids:
-        route.stations = []
+def nearest_stations(tree: cKDTree, station_ids: List[str], lat: float, lon: float,
+                     radius_km: float, nkeep: int = 10) -> List[str]:
+    """Return the IDs of the nkeep closest stations within radius_km of (lat, lon)."""
+    return nearest_stations_batch(tree, station_ids, np.array([lat]), np.array([lon]), radius_km, nkeep)[0]
+
+
+def update_routes_station_mapping(session: Session, mapping_rows: List[dict], route_ids: List[int]) -> None:
+    """
+    Replace the station links for a batch of routes: one DELETE for their
+    previous links, one executemany INSERT for the new ones. Writing the
+    mapping table directly avoids the per-route SELECT that hydrating
+    WeatherStation objects for the ORM collection required.
+    """
+    if not route_ids:
         return
-    stations = (
-        session.query(WeatherStation)
-        .filter(WeatherStation.station_id.in_(station_ids))
-        .all()
-    )
-    route.stations = stations
+    session.execute(delete(route_stations_mapping).where(route_stations_mapping.c.route_id.in_(route_ids)))
+    if mapping_rows:
+        session.execute(route_stations_mapping.insert(), mapping_rows)
 
 
 def update_weather_stations_interest_flag(session: Session) -> None:
@@ -77,17 +110,18 @@ def update_weather_stations_interest_flag(session: Session) -> None:
     Batch update the interest flag marking stations for which weather history should be scraped.
     Since default is true, update stations not existing in the relationship table to False.
     """
-    orphan_station_ids = (
-        session.query(WeatherStation.station_id)
-        .outerjoin(WeatherStation.routes)
-        .filter(Routes.route_id.is_(None))
-    ).subquery()
-
-    updated = (
-        session.query(WeatherStation)
-        .filter(WeatherStation.station_id.in_(orphan_station_ids))
-        .update({WeatherStation.of_interest: False}, synchronize_session=False)
+    # single anti-join UPDATE; the of_interest predicate keeps already-False
+    # rows untouched instead of rewriting them
+    result = session.execute(
+        update(WeatherStation)
+        .where(
+            ~exists().where(route_stations_mapping.c.station_id == WeatherStation.station_id),
+            WeatherStation.of_interest.is_(True),
+        )
+        .values(of_interest=False)
+        .execution_options(synchronize_session=False)
     )
+    updated = result.rowcount
     session.commit()
 
     logger.info("ws_attr.station_interest_flag.updated", extra={"stations_set_false": int(updated or 0)})
@@ -113,46 +147,82 @@ def weather_stations_attribution(mode: Literal["update", "reset"] = "update") ->
     NKEEP = 10
     COMMIT_EVERY = 200  # reduce transaction overhead
 
-    with Session(engine) as session:
-        routes_q = load_routes(session, country_id=COUNTRY_ID)
-
+    # commits inside the loop must not expire the route objects we keep
+    # iterating over, or every later attribute read would re-SELECT the row
+    with Session(engine, expire_on_commit=False) as session:
         if mode == "reset":
             reset_attribution(session)
-        else:
-            routes_q = check_routes_for_update(routes=routes_q)
 
-        routes = routes_q.all()
-        logger.info(
-            "ws_attr.routes.loaded",
-            extra={"mode": mode, "country_id": COUNTRY_ID, "routes_count": len(routes)},
-        )
+        all_station_ids, stations_tree = build_stations_index(session)
+        if stations_tree is None:
+            logger.warning("ws_attr.no_stations_in_db")
+            return
 
         processed = 0
         updated = 0
+        skipped_up_to_date = 0
         no_station_candidates = 0
         total_candidates = 0
 
+        # Plain (route_id, lat, lon, hash) rows instead of ORM instances: no
+        # identity map, no per-access attribute descriptors, and the streaming
+        # read finishes before the first write so commits never interrupt an
+        # open cursor.
+        work: List[Tuple[int, float, float]] = []
+        for route_id, lat, lon, old_hash in load_route_coords(session.get_bind(), country_id=COUNTRY_ID):
+            if mode != "reset" and not route_needs_attribution(lat, lon, old_hash):
+                skipped_up_to_date += 1
+                continue
+            work.append((route_id, lat, lon))
+
         logger.info(
             "ws_attr.attribution.begin",
-            extra={"radius_km": RADIUS_KM, "nkeep": NKEEP, "commit_every": COMMIT_EVERY},
+            extra={
+                "radius_km": RADIUS_KM,
+                "nkeep": NKEEP,
+                "commit_every": COMMIT_EVERY,
+                "routes_count": len(work),
+            },
         )
 
-        for route in tqdm(routes, disable=disable_tqdm):
-            processed += 1
-
-            stations = load_stations_within_radius(session, route.lat, route.lon, radius_km=RADIUS_KM)
-            total_candidates += len(stations)
-
-            if not stations:
-                no_station_candidates += 1
-                continue
-
-            station_ids = filter_stations(route, stations, nkeep=NKEEP)
-            update_routes_station_mapping(session, route, station_ids)
-            updated += 1
+        _update_hash = (
+            update(Routes)
+            .where(Routes.route_id == bindparam("b_route_id"))
+            .values(attribution_coord_hash=bindparam("b_hash"))
+        )
 
-            if processed % COMMIT_EVERY == 0:
-                session.commit()
+        def _attribute_batch(batch: List[Tuple[int, float, float]]) -> None:
+            """One vectorized tree lookup for the batch, then bulk mapping + hash flushes."""
+            nonlocal processed, updated, no_station_candidates, total_candidates
+            lats = np.array([lat for _, lat, _ in batch], dtype=np.float64)
+            lons = np.array([lon for _, _, lon in batch], dtype=np.float64)
+            station_ids_per_route = nearest_stations_batch(
+                stations_tree, all_station_ids, lats, lons, radius_km=RADIUS_KM, nkeep=NKEEP
+            )
+
+            pending_links: List[dict] = []
+            pending_route_ids: List[int] = []
+            hash_rows: List[dict] = []
+
+            for (route_id, lat, lon), station_ids in zip(batch, station_ids_per_route):
+                processed += 1
+                total_candidates += len(station_ids)
+                hash_rows.append({"b_route_id": route_id, "b_hash": coord_hash(lat, lon)})
+                # routes without candidates still get their stale links wiped
+                pending_route_ids.append(route_id)
+
+                if not station_ids:
+                    no_station_candidates += 1
+                else:
+                    pending_links.extend({"route_id": route_id, "station_id": sid} for sid in station_ids)
+                    updated += 1
+
+            update_routes_station_mapping(session, pending_links, pending_route_ids)
+            # Core executemany on the connection: Session.execute refuses an
+            # ORM UPDATE with extra WHERE criteria in executemany form
+            session.connection().execute(_update_hash, hash_rows)
+            session.commit()
+            if logger.isEnabledFor(logging.INFO):
                 logger.info(
                     "ws_attr.progress",
                     extra={
@@ -162,18 +232,20 @@ def weather_stations_attribution(mode: Literal["update", "reset"] = "update") ->
                     },
                 )
 
-        # final commit for remaining work
-        session.commit()
-
-        logger.info(
-            "ws_attr.attribution.done",
-            extra={
-                "processed": processed,
-                "updated": updated,
-                "no_station_candidates": no_station_candidates,
-                "avg_candidates_per_route": (total_candidates / processed) if processed else 0.0,
-            },
-        )
+        for start in tqdm(range(0, len(work), COMMIT_EVERY), disable=disable_tqdm):
+            _attribute_batch(work[start:start + COMMIT_EVERY])
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "ws_attr.attribution.done",
+                extra={
+                    "processed": processed,
+                    "updated": updated,
+                    "skipped_up_to_date": skipped_up_to_date,
+                    "no_station_candidates": no_station_candidates,
+                    "avg_candidates_per_route": (total_candidates / processed) if processed else 0.0,
+                },
+            )
 
         logger.info("ws_attr.station_interest_flag.begin")
         update_weather_stations_interest_flag(session=session)